@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import itertools
 import logging
+import os
 import pathlib
 import re
 import sys
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from datetime import datetime, timedelta, timezone
@@ -17,9 +19,11 @@ import ffmpeg
 import pathos
 import qbittorrentapi
 import requests
-from peewee import JOIN, SqliteDatabase
+from peewee import EXCLUDED, JOIN, OperationalError, SqliteDatabase, chunked, fn
 from pyarr import RadarrAPI, SonarrAPI
 from qbittorrentapi import TorrentDictionary, TorrentStates
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from qBitrr.arr_tables import CommandsModel, EpisodesModel, MoviesModel, SeriesModel
 from qBitrr.config import (
@@ -38,19 +42,21 @@ from qBitrr.errors import (
     SkipException,
     UnhandledError,
 )
-from qBitrr.logger import run_logs
+from qBitrr.logger import NOTICE, TRACE, run_logs
 from qBitrr.tables import (
     EpisodeFilesModel,
     EpisodeQueueModel,
     FilesQueued,
     MovieQueueModel,
     MoviesFilesModel,
+    ProbedFilesModel,
     SeriesFilesModel,
 )
 from qBitrr.utils import (
     ExpiringSet,
-    absolute_file_paths,
     has_internet,
+    is_empty_dir,
+    scandir_files,
     validate_and_return_torrent_file,
 )
 
@@ -58,6 +64,113 @@ if TYPE_CHECKING:
     from qBitrr.main import qBitManager
 
 
+_IGNORED_STATES = frozenset(
+    {
+        TorrentStates.FORCED_DOWNLOAD,
+        TorrentStates.FORCED_UPLOAD,
+        TorrentStates.CHECKING_UPLOAD,
+        TorrentStates.CHECKING_DOWNLOAD,
+        TorrentStates.CHECKING_RESUME_DATA,
+        TorrentStates.ALLOCATING,
+        TorrentStates.MOVING,
+        TorrentStates.QUEUED_DOWNLOAD,
+    }
+)
+_UPLOADING_STATES = frozenset(
+    {
+        TorrentStates.UPLOADING,
+        TorrentStates.STALLED_UPLOAD,
+        TorrentStates.QUEUED_UPLOAD,
+    }
+)
+_COMPLETE_STATES = frozenset(
+    {
+        TorrentStates.UPLOADING,
+        TorrentStates.STALLED_UPLOAD,
+        TorrentStates.PAUSED_UPLOAD,
+        TorrentStates.QUEUED_UPLOAD,
+    }
+)
+_DOWNLOADING_STATES = frozenset(
+    {
+        TorrentStates.DOWNLOADING,
+        TorrentStates.PAUSED_DOWNLOAD,
+    }
+)
+_TORRENT_STATUS_FMT = (
+    "[Progress: %s%%][Added On: %s]"
+    "[Availability: %s%%][Time Left: %s]"
+    "[Last active: %s] "
+    "| [%s] | %s (%s)"
+)
+_STALLED_STATES = frozenset(
+    {
+        TorrentStates.METADATA_DOWNLOAD,
+        TorrentStates.STALLED_DOWNLOAD,
+    }
+)
+_ARR_SECTION_RE = re.compile(r"(rad|son)arr.*", re.IGNORECASE)
+_ARR_CLS_MAP = {"son": SonarrAPI, "rad": RadarrAPI}
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_union(patterns: tuple[str, ...], case_sensitive: bool) -> re.Pattern:
+    # An empty alternation compiles to "" which matches everything,
+    # so fall back to a pattern that can never match.
+    flags = re.DOTALL if case_sensitive else re.IGNORECASE | re.DOTALL
+    return re.compile("|".join(f"(?:{p})" for p in patterns) or r"(?!x)x", flags)
+
+
+def _format_eta(seconds: int) -> str:
+    # Same output as str(timedelta(seconds=seconds)) without building the object.
+    days, seconds = divmod(int(seconds), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    clock = f"{hours}:{minutes:02d}:{seconds:02d}"
+    if days:
+        return f"{days} day{'s' if abs(days) != 1 else ''}, {clock}"
+    return clock
+
+
+@functools.lru_cache(maxsize=4096)
+def _regex_search(pattern: re.Pattern, text: str) -> str | None:
+    # Folder and file names repeat heavily across torrents, so remember the outcome.
+    match = pattern.search(text)
+    return match.group() if match else None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(cls: type[RadarrAPI | SonarrAPI], uri: str, apikey: str) -> RadarrAPI | SonarrAPI:
+    # Arr instances pointing at the same server share one client and therefore one
+    # keep-alive pool, sized for the metadata thread pool in Arr._db_update_batched.
+    client = cls(host_url=uri, api_key=apikey)
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # Only retry gateway errors; a down Arr must fail fast so is_alive keeps its 2s budget.
+        max_retries=Retry(
+            total=3,
+            connect=0,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    client.session = session
+    return client
+
+
+def _probe_file(path: str, cmd: str | pathlib.Path) -> tuple[bool, bytes | None]:
+    try:
+        return bool(ffmpeg.probe(path, cmd=cmd)), None
+    except ffmpeg.Error as e:
+        return False, e.stderr
+
+
 def _update_config():
     global APPDATA_FOLDER, COMPLETED_DOWNLOAD_FOLDER, FAILED_CATEGORY, LOOP_SLEEP_TIMER, NO_INTERNET_SLEEP_TIMER, RECHECK_CATEGORY, CONFIG
     from qBitrr.config import (
@@ -116,15 +229,18 @@ class Arr:
         self.case_sensitive_matches = CONFIG.get(
             f"{name}.Torrent.CaseSensitiveMatches", fallback=[]
         )
-        self.folder_exclusion_regex = CONFIG.get(
-            f"{name}.Torrent.FolderExclusionRegex", fallback=[]
+        self.folder_exclusion_regex: tuple[str, ...] = tuple(
+            CONFIG.get(f"{name}.Torrent.FolderExclusionRegex", fallback=[])
         )
-        self.file_name_exclusion_regex = CONFIG.get(
-            f"{name}.Torrent.FileNameExclusionRegex", fallback=[]
+        self.file_name_exclusion_regex: tuple[str, ...] = tuple(
+            CONFIG.get(f"{name}.Torrent.FileNameExclusionRegex", fallback=[])
         )
         self.file_extension_allowlist = CONFIG.get(
             f"{name}.Torrent.FileExtensionAllowlist", fallback=[]
         )
+        # Extensions are matched case-insensitively: both the configured entries and the file
+        # suffixes are lower-cased, so mixed-case entries such as ".!qB" match as well.
+        self._ext_allowlist = frozenset(e.lower() for e in self.file_extension_allowlist)
         self.auto_delete = CONFIG.get(f"{name}.Torrent.AutoDelete", fallback=False)
 
         self.remove_dead_trackers = CONFIG.get(
@@ -210,6 +326,8 @@ class Arr:
         self.arr_db_file = pathlib.Path(arr_db_file)
         self._app_data_folder = APPDATA_FOLDER
         self.search_db_file = self._app_data_folder.joinpath(f"{self._name}.db")
+        # Kept apart from the search DB, which the search loop holds write-locked during updates.
+        self.probe_db_file = self._app_data_folder.joinpath(f"{self._name}.probe.db")
         if self.search_missing and not self.arr_db_file.exists():
             self.logger.critical(
                 "Arr DB file cannot be located setting SearchMissing to False: %s",
@@ -258,25 +376,20 @@ class Arr:
         else:
             self.request_search_timer = None
 
-        if self.case_sensitive_matches:
-            self.folder_exclusion_regex_re = re.compile(
-                "|".join(self.folder_exclusion_regex), re.DOTALL
-            )
-            self.file_name_exclusion_regex_re = re.compile(
-                "|".join(self.file_name_exclusion_regex), re.DOTALL
-            )
-        else:
-            self.folder_exclusion_regex_re = re.compile(
-                "|".join(self.folder_exclusion_regex), re.IGNORECASE | re.DOTALL
-            )
-            self.file_name_exclusion_regex_re = re.compile(
-                "|".join(self.file_name_exclusion_regex), re.IGNORECASE | re.DOTALL
-            )
-        self.client = client_cls(host_url=self.uri, api_key=self.apikey)
+        self.folder_exclusion_regex_re = _compile_union(
+            self.folder_exclusion_regex, bool(self.case_sensitive_matches)
+        )
+        self.file_name_exclusion_regex_re = _compile_union(
+            self.file_name_exclusion_regex, bool(self.case_sensitive_matches)
+        )
+        self.client = _get_client(client_cls, self.uri, self.apikey)
+        # Bind the per-type row builder once instead of branching on self.type per row.
         if isinstance(self.client, SonarrAPI):
             self.type = "sonarr"
+            self._build_row = self._build_row_sonarr
         elif isinstance(self.client, RadarrAPI):
             self.type = "radarr"
+            self._build_row = self._build_row_radarr
 
         if self.rss_sync_timer > 0:
             self.rss_sync_timer_last_checked = datetime(1970, 1, 1)
@@ -294,7 +407,8 @@ class Arr:
         self.queue_file_ids = set()
         self.sent_to_scan = set()
         self.sent_to_scan_hashes = set()
-        self.files_probed = set()
+        self.files_probed: OrderedDict[tuple[str, int, float], None] = OrderedDict()
+        self._probe_model: type[ProbedFilesModel] | None = None
         self.import_torrents = []
         self.change_priority = dict()
         self.recheck = set()
@@ -312,156 +426,96 @@ class Arr:
         self.timed_skip = ExpiringSet(max_age_seconds=self.ignore_torrents_younger_than)
         self.tracker_delay = ExpiringSet(max_age_seconds=600)
         self.special_casing_file_check = ExpiringSet(max_age_seconds=10)
-        self.session = requests.Session()
+        self.session = self.client.session
+        self._status_url = f"{self.uri}/api/v3/system/status"
+        # Sent per request rather than set on the session, which also talks to Ombi/Overseerr.
+        self._status_headers = {"X-Api-Key": self.apikey}
         self.cleaned_torrents = set()
 
         self.manager.completed_folders.add(self.completed_folder)
         self.manager.category_allowlist.add(self.category)
 
-        self.logger.debug(
-            "%s Config: "
-            "Managed: %s, "
-            "Re-search: %s, "
-            "ImportMode: %s, "
-            "Category: %s, "
-            "URI: %s, "
-            "API Key: %s, "
-            "RefreshDownloadsTimer=%s, "
-            "RssSyncTimer=%s",
-            self._name,
-            self.import_mode,
-            self.managed,
-            self.re_search,
-            self.category,
-            self.uri,
-            self.apikey,
-            self.refresh_downloads_timer,
-            self.rss_sync_timer,
-        )
-        self.logger.debug(
-            "Script Config:  CaseSensitiveMatches=%s",
-            self.case_sensitive_matches,
-        )
-        self.logger.debug(
-            "Script Config:  FolderExclusionRegex=%s",
-            self.folder_exclusion_regex,
-        )
-        self.logger.debug(
-            "Script Config:  FileNameExclusionRegex=%s",
-            self.file_name_exclusion_regex,
-        )
-        self.logger.debug(
-            "Script Config:  FileExtensionAllowlist=%s",
-            self.file_extension_allowlist,
-        )
-        self.logger.debug("Script Config:  AutoDelete=%s", self.auto_delete)
-
-        self.logger.debug(
-            "Script Config:  IgnoreTorrentsYoungerThan=%s",
-            self.ignore_torrents_younger_than,
-        )
-        self.logger.debug("Script Config:  MaximumETA=%s", self.maximum_eta)
-
-        if self.search_missing:
-            self.logger.debug(
-                "Script Config:  SearchMissing=%s",
-                self.search_missing,
-            )
-            self.logger.debug(
-                "Script Config:  AlsoSearchSpecials=%s",
-                self.search_specials,
-            )
-            self.logger.debug(
-                "Script Config:  SearchByYear=%s",
-                self.search_by_year,
-            )
-            self.logger.debug(
-                "Script Config:  SearchInReverse=%s",
-                self.search_in_reverse,
-            )
-            self.logger.debug(
-                "Script Config:  StartYear=%s",
-                self.search_starting_year,
-            )
-            self.logger.debug(
-                "Script Config:  LastYear=%s",
-                self.search_ending_year,
-            )
-            self.logger.debug(
-                "Script Config:  CommandLimit=%s",
-                self.search_command_limit,
-            )
-            self.logger.debug(
-                "Script Config:  DatabaseFile=%s",
-                self.arr_db_file,
-            )
-            self.logger.debug(
-                "Script Config:  MaximumDeletablePercentage=%s",
-                self.maximum_deletable_percentage,
-            )
-            self.logger.debug(
-                "Script Config:  DoUpgradeSearch=%s",
-                self.do_upgrade_search,
-            )
-            self.logger.debug(
-                "Script Config:  PrioritizeTodaysReleases=%s",
-                self.prioritize_todays_release,
-            )
-            self.logger.debug(
-                "Script Config:  SearchBySeries=%s",
-                self.series_search,
-            )
-            self.logger.debug(
-                "Script Config:  SearchOmbiRequests=%s",
-                self.ombi_search_requests,
-            )
-            if self.ombi_search_requests:
-                self.logger.debug(
-                    "Script Config:  OmbiURI=%s",
-                    self.ombi_uri,
-                )
-                self.logger.debug(
-                    "Script Config:  OmbiAPIKey=%s",
-                    self.ombi_api_key,
-                )
-                self.logger.debug(
-                    "Script Config:  ApprovedOnly=%s",
-                    self.ombi_approved_only,
+        if self.logger.isEnabledFor(logging.DEBUG):
+            config = {
+                "Managed": self.managed,
+                "Re-search": self.re_search,
+                "ImportMode": self.import_mode,
+                "Category": self.category,
+                "URI": self.uri,
+                "API Key": self.apikey,
+                "RefreshDownloadsTimer": self.refresh_downloads_timer,
+                "RssSyncTimer": self.rss_sync_timer,
+                "CaseSensitiveMatches": self.case_sensitive_matches,
+                "FolderExclusionRegex": self.folder_exclusion_regex,
+                "FileNameExclusionRegex": self.file_name_exclusion_regex,
+                "FileExtensionAllowlist": self.file_extension_allowlist,
+                "AutoDelete": self.auto_delete,
+                "IgnoreTorrentsYoungerThan": self.ignore_torrents_younger_than,
+                "MaximumETA": self.maximum_eta,
+            }
+            if self.search_missing:
+                config.update(
+                    {
+                        "SearchMissing": self.search_missing,
+                        "AlsoSearchSpecials": self.search_specials,
+                        "SearchByYear": self.search_by_year,
+                        "SearchInReverse": self.search_in_reverse,
+                        "StartYear": self.search_starting_year,
+                        "LastYear": self.search_ending_year,
+                        "CommandLimit": self.search_command_limit,
+                        "DatabaseFile": self.arr_db_file,
+                        "MaximumDeletablePercentage": self.maximum_deletable_percentage,
+                        "DoUpgradeSearch": self.do_upgrade_search,
+                        "PrioritizeTodaysReleases": self.prioritize_todays_release,
+                        "SearchBySeries": self.series_search,
+                        "SearchOmbiRequests": self.ombi_search_requests,
+                    }
                 )
+                if self.ombi_search_requests:
+                    config["OmbiURI"] = self.ombi_uri
+                    config["OmbiAPIKey"] = self.ombi_api_key
+                    config["ApprovedOnly"] = self.ombi_approved_only
+                config["SearchOverseerrRequests"] = self.overseerr_requests
+                if self.overseerr_requests:
+                    config["OverseerrURI"] = self.overseerr_uri
+                    config["OverseerrAPIKey"] = self.overseerr_api_key
+                if self.ombi_search_requests or self.overseerr_requests:
+                    config["SearchRequestsEvery"] = self.search_requests_every_x_seconds
             self.logger.debug(
-                "Script Config:  SearchOverseerrRequests=%s",
-                self.overseerr_requests,
+                "%s Config:\n%s",
+                self._name,
+                "\n".join(f"  {k}={v}" for k, v in config.items()),
             )
-            if self.overseerr_requests:
-                self.logger.debug(
-                    "Script Config:  OverseerrURI=%s",
-                    self.overseerr_uri,
-                )
-                self.logger.debug(
-                    "Script Config:  OverseerrAPIKey=%s",
-                    self.overseerr_api_key,
-                )
-            if self.ombi_search_requests or self.overseerr_requests:
-                self.logger.debug(
-                    "Script Config:  SearchRequestsEvery=%s",
-                    self.search_requests_every_x_seconds,
-                )
         self.search_setup_completed = False
+        self._schema_created = False
+        self._search_tables = []
         self.model_arr_file: EpisodesModel | MoviesModel = None
         self.model_arr_series_file: SeriesModel = None
 
         self.model_arr_command: CommandsModel = None
+        self._active_commands_cache: tuple[float, int] | None = None
         self.model_file: EpisodeFilesModel | MoviesFilesModel = None
         self.series_file_model: SeriesFilesModel = None
         self.model_queue: EpisodeQueueModel | MovieQueueModel = None
         self.persistent_queue: FilesQueued = None
 
+    @property
+    def search_current_year(self) -> int:
+        return self._search_current_year
+
+    @search_current_year.setter
+    def search_current_year(self, year: int) -> None:
+        self._search_current_year = year
+        # Half-open UTC bounds so the AirDateUtc filter is a single index range scan.
+        self._year_lo = datetime(year, 1, 1, tzinfo=timezone.utc)
+        self._year_hi = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+
     @property
     def is_alive(self) -> bool:
         try:
             if self.session is None:
                 return True
-            req = self.session.get(f"{self.uri}/api/v3/system/status", timeout=2)
+            req = self.session.get(self._status_url, headers=self._status_headers, timeout=2)
             req.raise_for_status()
             self.logger.trace("Successfully connected to %s", self.uri)
             return True
@@ -471,44 +525,44 @@ class Arr:
             self.logger.warning("Could not connect to %s", self.uri)
         return False
 
+    def _log_torrent(
+        self, level: int, message: str, torrent: qbittorrentapi.TorrentDictionary, *args
+    ) -> None:
+        # The status fields cost several lookups plus datetime/timedelta objects per torrent,
+        # so only build them when the record is actually going to be emitted.
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            message + _TORRENT_STATUS_FMT,
+            *args,
+            round(torrent.progress * 100, 2),
+            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
+            round(torrent.availability * 100, 2),
+            _format_eta(torrent.eta),
+            datetime.fromtimestamp(torrent.last_activity),
+            torrent.state_enum,
+            torrent.name,
+            torrent.hash,
+        )
+
     @staticmethod
     def is_ignored_state(torrent: TorrentDictionary) -> bool:
-        return torrent.state_enum in (
-            TorrentStates.FORCED_DOWNLOAD,
-            TorrentStates.FORCED_UPLOAD,
-            TorrentStates.CHECKING_UPLOAD,
-            TorrentStates.CHECKING_DOWNLOAD,
-            TorrentStates.CHECKING_RESUME_DATA,
-            TorrentStates.ALLOCATING,
-            TorrentStates.MOVING,
-            TorrentStates.QUEUED_DOWNLOAD,
-        )
+        return torrent.state_enum in _IGNORED_STATES
 
     @staticmethod
     def is_uploading_state(torrent: TorrentDictionary) -> bool:
-        return torrent.state_enum in (
-            TorrentStates.UPLOADING,
-            TorrentStates.STALLED_UPLOAD,
-            TorrentStates.QUEUED_UPLOAD,
-        )
+        return torrent.state_enum in _UPLOADING_STATES
 
     @staticmethod
     def is_complete_state(torrent: TorrentDictionary) -> bool:
         """Returns True if the State is categorized as Complete."""
-        return torrent.state_enum in (
-            TorrentStates.UPLOADING,
-            TorrentStates.STALLED_UPLOAD,
-            TorrentStates.PAUSED_UPLOAD,
-            TorrentStates.QUEUED_UPLOAD,
-        )
+        return torrent.state_enum in _COMPLETE_STATES
 
     @staticmethod
     def is_downloading_state(torrent: TorrentDictionary) -> bool:
         """Returns True if the State is categorized as Downloading."""
-        return torrent.state_enum in (
-            TorrentStates.DOWNLOADING,
-            TorrentStates.PAUSED_DOWNLOAD,
-        )
+        return torrent.state_enum in _DOWNLOADING_STATES
 
     def _get_arr_modes(
         self,
@@ -576,7 +630,7 @@ class Arr:
             self._temp_overseer_request_cache = defaultdict(set)
             return self._temp_overseer_request_cache
         except Exception as e:
-            self.logger.exception(e, exc_info=sys.exc_info())
+            self.logger.exception(e, exc_info=True)
             self._temp_overseer_request_cache = defaultdict(set)
             return self._temp_overseer_request_cache
         else:
@@ -608,7 +662,7 @@ class Arr:
                 url=f"{self.ombi_uri}{extras}", headers={"ApiKey": self.ombi_api_key}
             )
         except Exception as e:
-            self.logger.exception(e, exc_info=sys.exc_info())
+            self.logger.exception(e, exc_info=True)
             return 0
         else:
             return response.json()
@@ -626,7 +680,7 @@ class Arr:
             )
             return response.json()
         except Exception as e:
-            self.logger.exception(e, exc_info=sys.exc_info())
+            self.logger.exception(e, exc_info=True)
             return []
 
     def _process_ombi_requests(self) -> dict[str, set[str, int]]:
@@ -780,52 +834,54 @@ class Arr:
         # Recheck all torrents marked for rechecking.
         if self.recheck:
             self.needs_cleanup = True
-            updated_recheck = [r for r in self.recheck]
-            self.manager.qbit.torrents_recheck(torrent_hashes=updated_recheck)
-            for k in updated_recheck:
-                self.timed_ignore_cache.add(k)
+            self.manager.qbit.torrents_recheck(torrent_hashes=list(self.recheck))
+            self.timed_ignore_cache.update(self.recheck)
             self.recheck.clear()
 
     def _process_failed(self) -> None:
+        if not (
+            self.delete
+            or self.skip_blacklist
+            or self.missing_files_post_delete
+            or self.missing_files_post_delete_blacklist
+        ):
+            return
+        # Keep this a set: a hash in several of these must only be blocklisted/re-searched once.
         to_delete_all = self.delete.union(self.skip_blacklist).union(
             self.missing_files_post_delete, self.missing_files_post_delete_blacklist
         )
-        if self.missing_files_post_delete or self.missing_files_post_delete_blacklist:
-            delete_ = True
-        else:
-            delete_ = False
         skip_blacklist = {
-            i.upper() for i in self.skip_blacklist.union(self.missing_files_post_delete)
+            i.upper() for i in itertools.chain(self.skip_blacklist, self.missing_files_post_delete)
         }
-        if to_delete_all:
-            self.needs_cleanup = True
-            payload, hashes = self.process_entries(to_delete_all)
-            if payload:
-                for entry, hash_ in payload:
-                    self._process_failed_individual(
-                        hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
-                    )
-            # Remove all bad torrents from the Client.
-            self.manager.qbit.torrents_delete(hashes=to_delete_all, delete_files=True)
-            for h in to_delete_all:
-                self.cleaned_torrents.discard(h)
-                self.sent_to_scan_hashes.discard(h)
-
-                if h in self.manager.qbit_manager.name_cache:
-                    del self.manager.qbit_manager.name_cache[h]
-                if h in self.manager.qbit_manager.cache:
-                    del self.manager.qbit_manager.cache[h]
-        if delete_:
-            self.missing_files_post_delete.clear()
-            self.missing_files_post_delete_blacklist.clear()
+        self.needs_cleanup = True
+        for entry, hash_ in self.process_entries(to_delete_all):
+            self._process_failed_individual(
+                hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
+            )
+        # Remove all bad torrents from the Client.
+        self.manager.qbit.torrents_delete(hashes=to_delete_all, delete_files=True)
+        name_cache = self.manager.qbit_manager.name_cache
+        cache = self.manager.qbit_manager.cache
+        for h in to_delete_all:
+            self.cleaned_torrents.discard(h)
+            self.sent_to_scan_hashes.discard(h)
+            name_cache.pop(h, None)
+            cache.pop(h, None)
+        self.missing_files_post_delete.clear()
+        self.missing_files_post_delete_blacklist.clear()
         self.skip_blacklist.clear()
         self.delete.clear()
 
     def _process_file_priority(self) -> None:
         # Set all files marked as "Do not download" to not download.
-        for hash_, files in self.change_priority.copy().items():
-            self.needs_cleanup = True
-            name = self.manager.qbit_manager.name_cache.get(hash_)
+        if not self.change_priority:
+            return
+        self.needs_cleanup = True
+        name_cache = self.manager.qbit_manager.name_cache
+        # Pop as we go so a failing call does not re-send the already applied entries next tick.
+        while self.change_priority:
+            hash_, files = self.change_priority.popitem()
+            name = name_cache.get(hash_)
             if name:
                 self.logger.debug(
                     "Updating file priority on torrent: %s (%s)",
@@ -837,30 +893,33 @@ class Arr:
                 )
             else:
                 self.logger.error("Torrent does not exist? %s", hash_)
-            del self.change_priority[hash_]
 
     def _process_resume(self) -> None:
         if self.resume:
             self.needs_cleanup = True
             self.manager.qbit.torrents_resume(torrent_hashes=self.resume)
-            for k in self.resume:
-                self.timed_ignore_cache.add(k)
+            self.timed_ignore_cache.update(self.resume)
             self.resume.clear()
 
     def _remove_empty_folders(self) -> None:
         new_sent_to_scan = set()
         if not self.completed_folder.exists():
             return
-        for path in absolute_file_paths(self.completed_folder):
-            if path.is_dir() and not len(list(absolute_file_paths(path))):
-                path.rmdir()
-                self.logger.trace("Removing empty folder: %s", path)
-                if path in self.sent_to_scan:
-                    self.sent_to_scan.discard(path)
-                else:
-                    new_sent_to_scan.add(path)
+        # Walk bottom-up so that folders emptied by removing their children are removed too.
+        for dirpath, dirnames, filenames in os.walk(self.completed_folder, topdown=False):
+            if filenames:
+                continue
+            path = pathlib.Path(dirpath)
+            if path == self.completed_folder or (dirnames and not is_empty_dir(path)):
+                continue
+            path.rmdir()
+            self.logger.trace("Removing empty folder: %s", path)
+            if path in self.sent_to_scan:
+                self.sent_to_scan.discard(path)
+            else:
+                new_sent_to_scan.add(path)
         self.sent_to_scan = new_sent_to_scan
-        if not len(list(absolute_file_paths(self.completed_folder))):
+        if is_empty_dir(self.completed_folder):
             self.sent_to_scan = set()
             self.sent_to_scan_hashes = set()
 
@@ -886,15 +945,26 @@ class Arr:
     def arr_db_query_commands_count(self) -> int:
         if not self.search_missing:
             return 0
-        search_commands = (
+        now = time.monotonic()
+        if self._active_commands_cache is not None:
+            checked_at, count = self._active_commands_cache
+            if now - checked_at < 5:
+                return count
+        count = (
             self.model_arr_command.select()
             .where(
                 (self.model_arr_command.EndedAt.is_null(True))
                 & (self.model_arr_command.Name.endswith("Search"))
             )
-            .execute()
+            .count()
         )
-        return len(list(search_commands))
+        self._active_commands_cache = (now, count)
+        return count
+
+    def _increment_active_commands_count(self) -> None:
+        # Avoid re-querying the Arr DB right after we queued a search ourselves.
+        if self._active_commands_cache is not None:
+            self._active_commands_cache = (time.monotonic(), self._active_commands_cache[1] + 1)
 
     def _search_todays(self, condition):
         if self.prioritize_todays_release:
@@ -908,7 +978,7 @@ class Arr:
                     self.model_file.SeasonNumber.desc(),
                     self.model_file.AirDateUtc.desc(),
                 )
-                .execute()
+                .iterator()
             ):
                 yield entry, True, True
         else:
@@ -927,6 +997,7 @@ class Arr:
                 yield i1, i2, i3, False
 
     def db_maybe_reset_entry_searched_state(self):
+        self._ensure_schema_created()
         if self.type == "sonarr":
             self.db_reset__series_searched_state()
             self.db_reset__episode_searched_state()
@@ -988,7 +1059,7 @@ class Arr:
                 self.series_file_model.select()
                 .where(condition)
                 .order_by(self.series_file_model.EntryId.asc())
-                .execute()
+                .iterator()
             ):
                 yield entry_, False, False
         elif self.type == "radarr":
@@ -1000,7 +1071,7 @@ class Arr:
                 self.model_file.select()
                 .where(condition)
                 .order_by(self.model_file.Title.asc())
-                .execute()
+                .iterator()
             ):
                 yield entry, False, False
 
@@ -1037,7 +1108,7 @@ class Arr:
                     self.model_file.AirDateUtc.desc(),
                 )
                 .group_by(self.model_file.SeriesId)
-                .execute()
+                .iterator()
             ):
                 condition_series = copy(condition)
                 condition_series &= self.model_file.SeriesId == entry_.SeriesId
@@ -1054,7 +1125,7 @@ class Arr:
                         self.model_file.SeasonNumber.desc(),
                         self.model_file.AirDateUtc.desc(),
                     )
-                    .execute()
+                    .iterator()
                 ):
                     yield entry, False, has_been_queried
                     has_been_queried = True
@@ -1073,7 +1144,7 @@ class Arr:
                 self.model_file.select()
                 .where(condition)
                 .order_by(self.model_file.Title.asc())
-                .execute()
+                .iterator()
             ):
                 yield entry, False, False
 
@@ -1106,7 +1177,7 @@ class Arr:
                     self.model_file.SeasonNumber.desc(),
                     self.model_file.AirDateUtc.desc(),
                 )
-                .execute()
+                .iterator()
             )
         elif self.type == "radarr":
             condition = self.model_file.Year <= datetime.now(timezone.utc).year
@@ -1121,10 +1192,11 @@ class Arr:
                 self.model_file.select()
                 .where(condition)
                 .order_by(self.model_file.Title.asc())
-                .execute()
+                .iterator()
             )
 
     def db_request_update(self):
+        self._ensure_schema_created()
         if self.overseerr_requests:
             self.db_overseerr_update()
         else:
@@ -1154,7 +1226,7 @@ class Arr:
                     condition &= imdb_con
                 elif tvdb_con:
                     condition &= tvdb_con
-                for db_entry in (
+                self._db_update_batched(
                     self.model_arr_file.select()
                     .join(
                         self.model_arr_series_file,
@@ -1162,9 +1234,9 @@ class Arr:
                         join_type=JOIN.LEFT_OUTER,
                     )
                     .switch(self.model_arr_file)
-                    .where(condition)
-                ):
-                    self.db_update_single_series(db_entry=db_entry, request=True)
+                    .where(condition),
+                    request=True,
+                )
             elif self.type == "radarr" and any(i in request_ids for i in ["ImdbId", "TmdbId"]):
                 self.model_arr_file: MoviesModel
                 condition = self.model_arr_file.Year <= datetime.now().year
@@ -1181,12 +1253,12 @@ class Arr:
                     condition &= tmdb_con
                 elif imdb_con:
                     condition &= imdb_con
-                for db_entry in (
+                self._db_update_batched(
                     self.model_arr_file.select()
                     .where(condition)
-                    .order_by(self.model_arr_file.Added.desc())
-                ):
-                    self.db_update_single_series(db_entry=db_entry, request=True)
+                    .order_by(self.model_arr_file.Added.desc()),
+                    request=True,
+                )
 
     def db_overseerr_update(self):
         if (not self.search_missing) or (not self.overseerr_requests):
@@ -1217,239 +1289,265 @@ class Arr:
             return
         with self.db.atomic():
             if self.type == "sonarr":
-                for series in self.model_arr_file.select().where(
-                    (self.model_arr_file.AirDateUtc.is_null(False))
-                    & (self.model_arr_file.AirDateUtc < datetime.now(timezone.utc))
-                    & (self.model_arr_file.AirDateUtc >= datetime.now(timezone.utc).date())
-                    & (
-                        self.model_arr_file.AbsoluteEpisodeNumber.is_null(False)
-                        | self.model_arr_file.SceneAbsoluteEpisodeNumber.is_null(False)
+                self._db_update_batched(
+                    self.model_arr_file.select().where(
+                        (self.model_arr_file.AirDateUtc.is_null(False))
+                        & (self.model_arr_file.AirDateUtc < datetime.now(timezone.utc))
+                        & (self.model_arr_file.AirDateUtc >= datetime.now(timezone.utc).date())
+                        & (
+                            self.model_arr_file.AbsoluteEpisodeNumber.is_null(False)
+                            | self.model_arr_file.SceneAbsoluteEpisodeNumber.is_null(False)
+                        )
                     )
-                ):
-                    self.db_update_single_series(db_entry=series)
+                )
 
     def db_update(self):
         if not self.search_missing:
             return
+        self._ensure_schema_created()
         self.logger.trace(f"Started updating database")
         self.db_update_todays_releases()
         with self.db.atomic():
 
             if self.type == "sonarr":
                 if not self.series_search:
-                    _series = set()
-                    for series in self.model_arr_file.select().where(
-                        (self.model_arr_file.AirDateUtc.is_null(False))
-                        & (self.model_arr_file.AirDateUtc < datetime.now(timezone.utc))
-                        & (
-                            self.model_arr_file.AbsoluteEpisodeNumber.is_null(False)
-                            | self.model_arr_file.SceneAbsoluteEpisodeNumber.is_null(False)
-                        )
-                        & (
-                            self.model_arr_file.AirDateUtc
-                            >= datetime(month=1, day=1, year=self.search_current_year)
+                    episodes = list(
+                        self.model_arr_file.select().where(
+                            (self.model_arr_file.AirDateUtc.is_null(False))
+                            & (self.model_arr_file.AirDateUtc < datetime.now(timezone.utc))
+                            & (
+                                self.model_arr_file.AbsoluteEpisodeNumber.is_null(False)
+                                | self.model_arr_file.SceneAbsoluteEpisodeNumber.is_null(False)
+                            )
+                            & (self.model_arr_file.AirDateUtc >= self._year_lo)
+                            & (self.model_arr_file.AirDateUtc < self._year_hi)
                         )
-                        & (
-                            self.model_arr_file.AirDateUtc
-                            <= datetime(month=12, day=31, year=self.search_current_year)
+                    )
+                    _series = {episode.SeriesId for episode in episodes}
+                    self._db_update_batched(episodes)
+                    self._db_update_batched(
+                        self.model_arr_file.select().where(
+                            self.model_arr_file.SeriesId.in_(_series)
                         )
-                    ):
-                        series: EpisodesModel
-                        _series.add(series.SeriesId)
-                        self.db_update_single_series(db_entry=series)
-                    for series in self.model_arr_file.select().where(
-                        self.model_arr_file.SeriesId.in_(_series)
-                    ):
-                        self.db_update_single_series(db_entry=series)
+                    )
                 else:
-                    for series in self.model_arr_series_file.select().order_by(
-                        self.model_arr_series_file.Added.desc()
-                    ):
-
-                        self.db_update_single_series(db_entry=series, series=True)
+                    self._db_update_batched(
+                        self.model_arr_series_file.select().order_by(
+                            self.model_arr_series_file.Added.desc()
+                        ),
+                        series=True,
+                    )
             elif self.type == "radarr":
-                for series in (
+                self._db_update_batched(
                     self.model_arr_file.select()
                     .where(self.model_arr_file.Year == self.search_current_year)
                     .order_by(self.model_arr_file.Added.desc())
-                ):
-                    self.db_update_single_series(db_entry=series)
+                )
         self.logger.trace(f"Finished updating database")
 
-    def db_update_single_series(
+    def _db_update_batched(
         self,
-        db_entry: EpisodesModel | SeriesModel | MoviesModel = None,
+        db_entries: Iterable[EpisodesModel | SeriesModel | MoviesModel],
         request: bool = False,
         series: bool = False,
     ):
-        if self.search_missing is False:
-            return
-        try:
-            searched = False
-            if self.type == "sonarr":
-                if not series:
-                    db_entry: EpisodesModel
-                    QualityUnmet = False
-                    if self.quality_unmet_search:
-                        QualityUnmet = self.client.get_episode_file(db_entry.Id).get(
-                            "qualityCutoffNotMet", False
-                        )
-                    if db_entry.EpisodeFileId != 0 and not QualityUnmet:
-                        searched = True
-                        self.model_queue.update(Completed=True).where(
-                            self.model_queue.EntryId == db_entry.Id
-                        ).execute()
-                    EntryId = db_entry.Id
-                    metadata = self.client.get_episode_by_episode_id(EntryId)
-                    SeriesTitle = metadata.get("series", {}).get("title")
-                    SeasonNumber = db_entry.SeasonNumber
-                    Title = db_entry.Title
-                    SeriesId = db_entry.SeriesId
-                    EpisodeFileId = db_entry.EpisodeFileId
-                    EpisodeNumber = db_entry.EpisodeNumber
-                    AbsoluteEpisodeNumber = db_entry.AbsoluteEpisodeNumber
-                    SceneAbsoluteEpisodeNumber = db_entry.SceneAbsoluteEpisodeNumber
-                    LastSearchTime = db_entry.LastSearchTime
-                    AirDateUtc = db_entry.AirDateUtc
-                    Monitored = db_entry.Monitored
-                    searched = searched
-                    QualityMet = db_entry.EpisodeFileId != 0 and not QualityUnmet
-
-                    if self.quality_unmet_search and QualityMet:
-                        self.logger.trace(
-                            "Quality Met | %s | S%02dE%03d",
-                            SeriesTitle,
-                            SeasonNumber,
-                            EpisodeNumber,
-                        )
-
-                    self.logger.trace(
-                        "Updating database entry | %s | S%02dE%03d",
-                        SeriesTitle,
-                        SeasonNumber,
-                        EpisodeNumber,
-                    )
-                    to_update = {
-                        self.model_file.Monitored: Monitored,
-                        self.model_file.Title: Title,
-                        self.model_file.AirDateUtc: AirDateUtc,
-                        self.model_file.LastSearchTime: LastSearchTime,
-                        self.model_file.SceneAbsoluteEpisodeNumber: SceneAbsoluteEpisodeNumber,
-                        self.model_file.AbsoluteEpisodeNumber: AbsoluteEpisodeNumber,
-                        self.model_file.EpisodeNumber: EpisodeNumber,
-                        self.model_file.EpisodeFileId: EpisodeFileId,
-                        self.model_file.SeriesId: SeriesId,
-                        self.model_file.SeriesTitle: SeriesTitle,
-                        self.model_file.SeasonNumber: SeasonNumber,
-                        self.model_file.QualityMet: QualityMet,
-                    }
-                    if searched:
-                        to_update[self.model_file.Searched] = searched
-
-                    if request:
-                        to_update[self.model_file.IsRequest] = request
-
-                    db_commands = self.model_file.insert(
-                        EntryId=EntryId,
-                        Title=Title,
-                        SeriesId=SeriesId,
-                        EpisodeFileId=EpisodeFileId,
-                        EpisodeNumber=EpisodeNumber,
-                        AbsoluteEpisodeNumber=AbsoluteEpisodeNumber,
-                        SceneAbsoluteEpisodeNumber=SceneAbsoluteEpisodeNumber,
-                        LastSearchTime=LastSearchTime,
-                        AirDateUtc=AirDateUtc,
-                        Monitored=Monitored,
-                        SeriesTitle=SeriesTitle,
-                        SeasonNumber=SeasonNumber,
-                        Searched=searched,
-                        IsRequest=request,
-                        QualityMet=QualityMet,
-                    ).on_conflict(
-                        conflict_target=[self.model_file.EntryId],
-                        update=to_update,
+        # Episode metadata is one blocking HTTP call per entry, fetch each batch concurrently.
+        prefetch = self.type == "sonarr" and not series
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for batch in chunked(db_entries, 500):
+                if prefetch:
+                    metadata = executor.map(
+                        self._fetch_episode_metadata, [db_entry.Id for db_entry in batch]
                     )
                 else:
-                    db_entry: SeriesModel
-                    EntryId = db_entry.Id
-                    metadata = self.client.get_series(id_=EntryId)
-                    episode_count = metadata.get("episodeCount", -2)
-                    searched = episode_count == metadata.get("episodeFileCount", -1)
-                    if episode_count == 0:
-                        searched = True
-                    Title = metadata.get("title")
-                    Monitored = db_entry.Monitored
-                    self.logger.trace(
-                        "Updating database entry | %s",
-                        Title,
-                    )
-                    to_update = {
-                        self.series_file_model.Monitored: Monitored,
-                        self.series_file_model.Title: Title,
-                    }
-                    if searched:
-                        to_update[self.series_file_model.Searched] = searched
-
-                    db_commands = self.series_file_model.insert(
-                        EntryId=EntryId, Title=Title, Searched=searched, Monitored=Monitored
-                    ).on_conflict(
-                        conflict_target=[self.series_file_model.EntryId],
-                        update=to_update,
+                    metadata = itertools.repeat(None)
+                rows = []
+                for db_entry, meta in zip(batch, metadata):
+                    if prefetch and meta is None:
+                        continue
+                    row = self._build_row(
+                        db_entry=db_entry, request=request, series=series, metadata=meta
                     )
+                    if row is not None:
+                        rows.append(row)
+                self._flush(rows, request=request, series=series)
 
-            elif self.type == "radarr":
-                db_entry: MoviesModel
-                searched = False
+    def _fetch_episode_metadata(self, entry_id: int) -> dict | None:
+        try:
+            return self.client.get_episode_by_episode_id(entry_id)
+        except Exception as e:
+            self.logger.error(e, exc_info=True)
+            return None
+
+    def _build_row_sonarr(
+        self,
+        db_entry: EpisodesModel | SeriesModel,
+        request: bool = False,
+        series: bool = False,
+        metadata: dict | None = None,
+    ) -> dict | None:
+        try:
+            searched = False
+            if not series:
+                db_entry: EpisodesModel
                 QualityUnmet = False
                 if self.quality_unmet_search:
-                    QualityUnmet = any(
-                        i["qualityCutoffNotMet"]
-                        for i in self.client.get_movie_files_by_movie_id(db_entry.Id)
-                        if "qualityCutoffNotMet" in i
+                    QualityUnmet = self.client.get_episode_file(db_entry.Id).get(
+                        "qualityCutoffNotMet", False
                     )
-                if db_entry.MovieFileId != 0 and not QualityUnmet:
+                if db_entry.EpisodeFileId != 0 and not QualityUnmet:
                     searched = True
                     self.model_queue.update(Completed=True).where(
                         self.model_queue.EntryId == db_entry.Id
                     ).execute()
-
-                title = db_entry.Title
-                monitored = db_entry.Monitored
-                tmdbId = db_entry.TmdbId
-                year = db_entry.Year
                 EntryId = db_entry.Id
-                MovieFileId = db_entry.MovieFileId
+                # Prefetched by _db_update_batched, which drops entries whose fetch failed.
+                SeriesTitle = metadata.get("series", {}).get("title")
+                SeasonNumber = db_entry.SeasonNumber
+                EpisodeNumber = db_entry.EpisodeNumber
+                QualityMet = db_entry.EpisodeFileId != 0 and not QualityUnmet
 
-                QualityMet = db_entry.MovieFileId != 0 and not QualityUnmet
+                if self.quality_unmet_search and QualityMet:
+                    self.logger.trace(
+                        "Quality Met | %s | S%02dE%03d",
+                        SeriesTitle,
+                        SeasonNumber,
+                        EpisodeNumber,
+                    )
 
-                self.logger.trace("Updating database entry | %s (%s)", title, tmdbId)
-                to_update = {
-                    self.model_file.MovieFileId: MovieFileId,
-                    self.model_file.Monitored: monitored,
-                    self.model_file.QualityMet: QualityMet,
+                self.logger.trace(
+                    "Updating database entry | %s | S%02dE%03d",
+                    SeriesTitle,
+                    SeasonNumber,
+                    EpisodeNumber,
+                )
+                return {
+                    "EntryId": EntryId,
+                    "Title": db_entry.Title,
+                    "SeriesId": db_entry.SeriesId,
+                    "EpisodeFileId": db_entry.EpisodeFileId,
+                    "EpisodeNumber": EpisodeNumber,
+                    "AbsoluteEpisodeNumber": db_entry.AbsoluteEpisodeNumber,
+                    "SceneAbsoluteEpisodeNumber": db_entry.SceneAbsoluteEpisodeNumber,
+                    "LastSearchTime": db_entry.LastSearchTime,
+                    "AirDateUtc": db_entry.AirDateUtc,
+                    "Monitored": db_entry.Monitored,
+                    "SeriesTitle": SeriesTitle,
+                    "SeasonNumber": SeasonNumber,
+                    "Searched": searched,
+                    "IsRequest": request,
+                    "QualityMet": QualityMet,
                 }
-                if searched:
-                    to_update[self.model_file.Searched] = searched
-                if request:
-                    to_update[self.model_file.IsRequest] = request
-                db_commands = self.model_file.insert(
-                    Title=title,
-                    Monitored=monitored,
-                    TmdbId=tmdbId,
-                    Year=year,
-                    EntryId=EntryId,
-                    Searched=searched,
-                    MovieFileId=MovieFileId,
-                    IsRequest=request,
-                    QualityMet=QualityMet,
-                ).on_conflict(
-                    conflict_target=[self.model_file.EntryId],
-                    update=to_update,
+            else:
+                db_entry: SeriesModel
+                EntryId = db_entry.Id
+                metadata = self.client.get_series(id_=EntryId)
+                episode_count = metadata.get("episodeCount", -2)
+                searched = episode_count == metadata.get("episodeFileCount", -1)
+                if episode_count == 0:
+                    searched = True
+                Title = metadata.get("title")
+                self.logger.trace(
+                    "Updating database entry | %s",
+                    Title,
                 )
-            db_commands.execute()
+                return {
+                    "EntryId": EntryId,
+                    "Title": Title,
+                    "Searched": searched,
+                    "Monitored": db_entry.Monitored,
+                }
+        except Exception as e:
+            self.logger.error(e, exc_info=True)
+        return None
 
+    def _build_row_radarr(
+        self,
+        db_entry: MoviesModel,
+        request: bool = False,
+        series: bool = False,
+        metadata: dict | None = None,
+    ) -> dict | None:
+        try:
+            searched = False
+            QualityUnmet = False
+            if self.quality_unmet_search:
+                QualityUnmet = any(
+                    i["qualityCutoffNotMet"]
+                    for i in self.client.get_movie_files_by_movie_id(db_entry.Id)
+                    if "qualityCutoffNotMet" in i
+                )
+            if db_entry.MovieFileId != 0 and not QualityUnmet:
+                searched = True
+                self.model_queue.update(Completed=True).where(
+                    self.model_queue.EntryId == db_entry.Id
+                ).execute()
+
+            self.logger.trace("Updating database entry | %s (%s)", db_entry.Title, db_entry.TmdbId)
+            return {
+                "Title": db_entry.Title,
+                "Monitored": db_entry.Monitored,
+                "TmdbId": db_entry.TmdbId,
+                "Year": db_entry.Year,
+                "EntryId": db_entry.Id,
+                "Searched": searched,
+                "MovieFileId": db_entry.MovieFileId,
+                "IsRequest": request,
+                "QualityMet": db_entry.MovieFileId != 0 and not QualityUnmet,
+            }
         except Exception as e:
-            self.logger.error(e, exc_info=sys.exc_info())
+            self.logger.error(e, exc_info=True)
+        return None
+
+    def _flush(self, rows: list[dict], request: bool = False, series: bool = False):
+        if not rows:
+            return
+        if self.type == "sonarr" and series:
+            model = self.series_file_model
+            fields = [model.Monitored, model.Title]
+        elif self.type == "sonarr":
+            model = self.model_file
+            fields = [
+                model.Monitored,
+                model.Title,
+                model.AirDateUtc,
+                model.LastSearchTime,
+                model.SceneAbsoluteEpisodeNumber,
+                model.AbsoluteEpisodeNumber,
+                model.EpisodeNumber,
+                model.EpisodeFileId,
+                model.SeriesId,
+                model.SeriesTitle,
+                model.SeasonNumber,
+                model.QualityMet,
+            ]
+        else:
+            model = self.model_file
+            fields = [model.MovieFileId, model.Monitored, model.QualityMet]
+        to_update = {field: getattr(EXCLUDED, field.column_name) for field in fields}
+        # Never reset an entry back to un-searched, only flag it once it has been searched.
+        to_update[model.Searched] = fn.MAX(model.Searched, EXCLUDED.Searched)
+        if request:
+            to_update[model.IsRequest] = EXCLUDED.IsRequest
+        # SQLite < 3.32 caps a statement at 999 bound parameters.
+        for index, batch in enumerate(chunked(rows, 50)):
+            # A bad chunk must not take the rest of the rows down with it.
+            try:
+                model.insert_many(batch).on_conflict(
+                    conflict_target=[model.EntryId],
+                    update=to_update,
+                ).execute()
+            except Exception as e:
+                self.logger.error(
+                    "Failed to write rows %s-%s of %s (EntryId %s to %s): %s",
+                    index * 50 + 1,
+                    index * 50 + len(batch),
+                    len(rows),
+                    batch[0].get("EntryId"),
+                    batch[-1].get("EntryId"),
+                    e,
+                    exc_info=True,
+                )
 
     def delete_from_queue(self, id_, remove_from_client=True, blacklist=True):
         params = {
@@ -1461,35 +1559,135 @@ class Arr:
         res = self.client.request_del(path, params=params)
         return res
 
-    def file_is_probeable(self, file: pathlib.Path) -> bool:
+    def _get_probe_model(self) -> type[ProbedFilesModel]:
+        # Opened lazily so the connection belongs to the process running folder_cleanup.
+        if self._probe_model is None:
+            db = SqliteDatabase(None, autoconnect=True)
+            db.init(
+                str(self.probe_db_file),
+                pragmas={
+                    "journal_mode": "wal",
+                    "synchronous": 0,
+                },
+            )
+
+            class ProbedFiles(ProbedFilesModel):
+                class Meta:
+                    database = db
+
+            db.create_tables([ProbedFiles])
+            self._probe_model = ProbedFiles
+        return self._probe_model
+
+    def _remember_probed(self, key: tuple[str, int, float]) -> None:
+        self.files_probed[key] = None
+        self.files_probed.move_to_end(key)
+        if len(self.files_probed) > 1024:
+            self.files_probed.popitem(last=False)
+
+    def _store_probe_result(self, path: str, stat: os.stat_result, ok: bool) -> None:
+        try:
+            self._get_probe_model().insert(
+                Path=path, Size=stat.st_size, MTime=stat.st_mtime, Ok=ok
+            ).on_conflict_replace().execute()
+        except OperationalError as e:
+            self.logger.debug("Probe cache unavailable, not storing result for %s: %s", path, e)
+
+    def _forget_probe_result(self, file: pathlib.Path) -> None:
+        # Nothing can have been cached if the probe DB was never opened by this process.
+        if self._probe_model is None:
+            return
+        model = self._probe_model
+        try:
+            model.delete().where(model.Path == str(file.absolute())).execute()
+        except OperationalError as e:
+            self.logger.debug("Probe cache unavailable, not forgetting %s: %s", file, e)
+
+    def _probe_cache_lookup(
+        self, file: pathlib.Path
+    ) -> tuple[bool | None, str | None, os.stat_result | None]:
+        if file.is_dir():
+            self.logger.trace("Not Probeable: File is a directory: %s", file)
+            return False, None, None
+        path = str(file.absolute())
+        stat = file.stat()
+        key = (path, stat.st_size, stat.st_mtime)
+        if key in self.files_probed:
+            self.files_probed.move_to_end(key)
+            self.logger.trace("Probeable: File has already been probed: %s", file)
+            return True, path, stat
+        # Results are only reused while the file's size and mtime are unchanged.
+        try:
+            model = self._get_probe_model()
+            cached = model.get_or_none(model.Path == path)
+        except OperationalError as e:
+            self.logger.debug("Probe cache unavailable, probing %s directly: %s", file, e)
+            return None, path, stat
+        if (
+            cached is not None
+            and cached.Size == stat.st_size
+            and abs(cached.MTime - stat.st_mtime) < 1
+        ):
+            self.logger.trace("Probe cache hit (%s): %s", cached.Ok, file)
+            if cached.Ok:
+                self._remember_probed(key)
+            return cached.Ok, path, stat
+        return None, path, stat
+
+    def _record_probe_result(
+        self,
+        file: pathlib.Path,
+        path: str,
+        stat: os.stat_result,
+        ok: bool,
+        stderr: bytes | None,
+    ) -> bool:
+        if stderr is not None:
+            self.logger.trace("Not Probeable: Probe returned an error: %s:\n%s", file, stderr)
+        elif not ok:
+            self.logger.trace("Not Probeable: Probe returned no output: %s", file)
+        self._store_probe_result(path, stat, ok)
+        if ok:
+            self._remember_probed((path, stat.st_size, stat.st_mtime))
+        return ok
+
+    def files_probeable(self, files: Iterable[pathlib.Path]) -> dict[pathlib.Path, bool]:
         if not self.manager.ffprobe_available:
-            return True  # ffprobe is not found, so we say every file is acceptable.
+            # ffprobe is not found, so we say every file is acceptable.
+            return {file: True for file in files}
+        results = {}
+        to_probe = []
+        for file in files:
+            try:
+                ok, path, stat = self._probe_cache_lookup(file)
+            except FileNotFoundError:
+                # The Arr can move or delete files mid-scan while importing them; a file
+                # that is already gone is left out of the results rather than removed.
+                self.logger.trace("Not Probeable: File no longer exists: %s", file)
+                continue
+            if ok is None:
+                to_probe.append((file, path, stat))
+            else:
+                results[file] = ok
+        if to_probe:
+            cmd = self.manager.ffprobe_path
+            # Each probe is its own ffprobe subprocess, so threads are enough to run them
+            # concurrently (and this already runs inside a daemonic child process).
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                outcomes = executor.map(
+                    _probe_file, [path for _, path, _ in to_probe], itertools.repeat(cmd)
+                )
+                for (file, path, stat), (ok, stderr) in zip(to_probe, outcomes):
+                    results[file] = self._record_probe_result(file, path, stat, ok, stderr)
+        return results
+
+    def _remove_cleanup_file(self, file: pathlib.Path) -> None:
         try:
-            if file in self.files_probed:
-                self.logger.trace("Probeable: File has already been probed: %s", file)
-                return True
-            if file.is_dir():
-                self.logger.trace("Not Probeable: File is a directory: %s", file)
-                return False
-            output = ffmpeg.probe(
-                str(file.absolute()), cmd=self.manager.qbit_manager.ffprobe_downloader.probe_path
-            )
-            if not output:
-                self.logger.trace("Not Probeable: Probe returned no output: %s", file)
-                return False
-            self.files_probed.add(file)
-            return True
-        except ffmpeg.Error as e:
-            error = e.stderr.decode()
-            self.logger.trace(
-                "Not Probeable: Probe returned an error: %s:\n%s",
-                file,
-                e.stderr,
-                exc_info=sys.exc_info(),
-            )
-            if "Invalid data found when processing input" in error:
-                return False
-            return False
+            file.unlink(missing_ok=True)
+            self._forget_probe_result(file)
+            self.logger.debug("File removed: %s", file)
+        except PermissionError:
+            self.logger.debug("File in use: Failed to remove file: %s", file)
 
     def folder_cleanup(self) -> None:
         if self.auto_delete is False:
@@ -1499,31 +1697,29 @@ class Arr:
             return
         folder = self.completed_folder
         self.logger.debug("Folder Cleanup: %s", folder)
-        for file in absolute_file_paths(folder):
-            if file.name in {"desktop.ini", ".DS_Store"}:
+        candidates = []
+        for entry, suffix in scandir_files(folder):
+            if entry.name in {"desktop.ini", ".DS_Store"}:
                 continue
-            elif file.suffix.lower() == ".parts":
+            elif suffix == ".parts":
                 continue
-            if not file.exists():
+            file = pathlib.Path(entry.path)
+            if suffix in self._ext_allowlist:
+                self.logger.trace("Folder Cleanup: File has an allowed extension: %s", file)
+                candidates.append(file)
                 continue
-            if file.is_dir():
-                self.logger.trace("Folder Cleanup: File is a folder: %s", file)
+            self._remove_cleanup_file(file)
+        for file, probeable in self.files_probeable(candidates).items():
+            if probeable:
+                self.logger.trace("Folder Cleanup: File is a valid media type: %s", file)
                 continue
-            if file.suffix.lower() in self.file_extension_allowlist:
-                self.logger.trace("Folder Cleanup: File has an allowed extension: %s", file)
-                if self.file_is_probeable(file):
-                    self.logger.trace("Folder Cleanup: File is a valid media type: %s", file)
-                    continue
-            try:
-                file.unlink(missing_ok=True)
-                self.logger.debug("File removed: %s", file)
-            except PermissionError:
-                self.logger.debug("File in use: Failed to remove file: %s", file)
+            self._remove_cleanup_file(file)
         for file in self.files_to_explicitly_delete:
             if not file.exists():
                 continue
             try:
                 file.unlink(missing_ok=True)
+                self._forget_probe_result(file)
                 self.logger.debug("File removed: File was marked as failed by Arr | %s", file)
             except PermissionError:
                 self.logger.debug(
@@ -1565,7 +1761,7 @@ class Arr:
                     queue = (
                         self.model_queue.select()
                         .where(self.model_queue.EntryId == file_model.EntryId)
-                        .execute()
+                        .exists()
                     )
                 else:
                     queue = False
@@ -1605,15 +1801,17 @@ class Arr:
                         file_model.AirDateUtc,
                     )
                     return False
-                self.persistent_queue.insert(
-                    EntryId=file_model.SeriesId
-                ).on_conflict_ignore().execute()
-                self.model_queue.insert(
-                    Completed=False,
-                    EntryId=file_model.EntryId,
-                ).on_conflict_replace().execute()
+                with self.db.atomic():
+                    self.persistent_queue.insert(
+                        EntryId=file_model.SeriesId
+                    ).on_conflict_ignore().execute()
+                    self.model_queue.insert(
+                        Completed=False,
+                        EntryId=file_model.EntryId,
+                    ).on_conflict_replace().execute()
                 if file_model.EntryId not in self.queue_file_ids:
                     self.client.post_command("EpisodeSearch", episodeIds=[file_model.EntryId])
+                    self._increment_active_commands_count()
                 file_model.Searched = True
                 file_model.save()
                 self.logger.hnotice(
@@ -1643,14 +1841,16 @@ class Arr:
                         file_model.EntryId,
                     )
                     return False
-                self.persistent_queue.insert(
-                    EntryId=file_model.EntryId
-                ).on_conflict_ignore().execute()
-                self.model_queue.insert(
-                    Completed=False,
-                    EntryId=file_model.EntryId,
-                ).on_conflict_replace().execute()
+                with self.db.atomic():
+                    self.persistent_queue.insert(
+                        EntryId=file_model.EntryId
+                    ).on_conflict_ignore().execute()
+                    self.model_queue.insert(
+                        Completed=False,
+                        EntryId=file_model.EntryId,
+                    ).on_conflict_replace().execute()
                 self.client.post_command("SeriesSearch", seriesId=file_model.EntryId)
+                self._increment_active_commands_count()
                 file_model.Searched = True
                 file_model.save()
                 self.logger.hnotice(
@@ -1666,7 +1866,7 @@ class Arr:
                 queue = (
                     self.model_queue.select()
                     .where(self.model_queue.EntryId == file_model.EntryId)
-                    .execute()
+                    .exists()
                 )
             else:
                 queue = False
@@ -1698,14 +1898,17 @@ class Arr:
                     file_model.EntryId,
                 )
                 return False
-            self.persistent_queue.insert(EntryId=file_model.EntryId).on_conflict_ignore().execute()
-
-            self.model_queue.insert(
-                Completed=False,
-                EntryId=file_model.EntryId,
-            ).on_conflict_replace().execute()
+            with self.db.atomic():
+                self.persistent_queue.insert(
+                    EntryId=file_model.EntryId
+                ).on_conflict_ignore().execute()
+                self.model_queue.insert(
+                    Completed=False,
+                    EntryId=file_model.EntryId,
+                ).on_conflict_replace().execute()
             if file_model.EntryId not in self.queue_file_ids:
                 self.client.post_command("MoviesSearch", movieIds=[file_model.EntryId])
+                self._increment_active_commands_count()
             file_model.Searched = True
             file_model.save()
             self.logger.hnotice(
@@ -1736,13 +1939,9 @@ class Arr:
         self._process_failed()
         self.folder_cleanup()
 
-    def process_entries(self, hashes: set[str]) -> tuple[list[tuple[int, str]], set[str]]:
-        payload = [
-            (_id, h.upper()) for h in hashes if (_id := self.cache.get(h.upper())) is not None
-        ]
-        hashes = {h for h in hashes if (_id := self.cache.get(h.upper())) is not None}
-
-        return payload, hashes
+    def process_entries(self, hashes: Iterable[str]) -> list[tuple[int, str]]:
+        cache = self.cache
+        return [(_id, upper) for h in hashes if (_id := cache.get(upper := h.upper())) is not None]
 
     def process_torrents(self):
         if has_internet() is False:
@@ -1756,130 +1955,51 @@ class Arr:
             torrents = self.manager.qbit_manager.client.torrents.info.all(
                 category=self.category, sort="added_on", reverse=False
             )
+            time_now = time.time()
+            process_single_torrent = self._process_single_torrent
+            not_found = qbittorrentapi.exceptions.NotFound404Error
             for torrent in torrents:
-                with contextlib.suppress(qbittorrentapi.exceptions.NotFound404Error):
-                    self._process_single_torrent(torrent)
+                with contextlib.suppress(not_found):
+                    process_single_torrent(torrent, time_now)
             self.process()
         except NoConnectionrException as e:
             self.logger.error(e.message)
         except Exception as e:
-            self.logger.error(e, exc_info=sys.exc_info())
+            self.logger.error(e, exc_info=True)
 
     def _process_single_torrent_failed_cat(self, torrent: qbittorrentapi.TorrentDictionary):
-        self.logger.notice(
-            "Deleting manually failed torrent: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(NOTICE, "Deleting manually failed torrent: ", torrent)
         self.delete.add(torrent.hash)
 
     def _process_single_torrent_recheck_cat(self, torrent: qbittorrentapi.TorrentDictionary):
-        self.logger.notice(
-            "Re-checking manually set torrent: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(NOTICE, "Re-checking manually set torrent: ", torrent)
         self.recheck.add(torrent.hash)
 
-    def _process_single_torrent_ignored(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_ignored(
+        self, torrent: qbittorrentapi.TorrentDictionary, time_now: float
+    ):
         # Do not touch torrents that are currently being ignored.
-        self.logger.trace(
-            "Skipping torrent: Ignored state | "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Skipping torrent: Ignored state | ", torrent)
         if torrent.state_enum == TorrentStates.QUEUED_DOWNLOAD:
-            self.recently_queue[torrent.hash] = time.time()
+            self.recently_queue[torrent.hash] = time_now
 
     def _process_single_torrent_added_to_ignore_cache(
         self, torrent: qbittorrentapi.TorrentDictionary
     ):
-        self.logger.trace(
-            "Skipping torrent: Marked for skipping | "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Skipping torrent: Marked for skipping | ", torrent)
 
     def _process_single_torrent_queued_upload(
         self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
     ):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
-            self.logger.trace(
-                "Torrent State: Queued Upload | Allowing Seeding | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(TRACE, "Torrent State: Queued Upload | Allowing Seeding | ", torrent)
         else:
             self.pause.add(torrent.hash)
             self.skip_blacklist.add(torrent.hash)
-            self.logger.trace(
-                "Pausing torrent: Queued Upload | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(TRACE, "Pausing torrent: Queued Upload | ", torrent)
 
     def _process_single_torrent_stalled_torrent(
-        self, torrent: qbittorrentapi.TorrentDictionary, extra: str
+        self, torrent: qbittorrentapi.TorrentDictionary, extra: str, time_now: float
     ):
 
         # Process torrents who have stalled at this point, only mark for
@@ -1887,44 +2007,15 @@ class Arr:
         # seconds ago
         if (
             self.recently_queue.get(torrent.hash, torrent.added_on)
-            < time.time() - self.ignore_torrents_younger_than
+            < time_now - self.ignore_torrents_younger_than
         ):
-            self.logger.info(
-                "Deleting Stale torrent: %s | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                extra,
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(logging.INFO, "Deleting Stale torrent: %s | ", torrent, extra)
             self.delete.add(torrent.hash)
         else:
-            self.logger.trace(
-                "Ignoring Stale torrent: "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(TRACE, "Ignoring Stale torrent: ", torrent)
 
     def _process_single_torrent_percentage_threshold(
-        self, torrent: qbittorrentapi.TorrentDictionary, maximum_eta: int
+        self, torrent: qbittorrentapi.TorrentDictionary, maximum_eta: int, time_now: float
     ):
         # Ignore torrents who have reached maximum percentage as long as
         # the last activity is within the MaximumETA set for this category
@@ -1936,133 +2027,42 @@ class Arr:
         # may contribute towards your progress.
         # However if its completely dead and no activity is observed, then lets
         # remove it and requeue a new torrent.
-        if maximum_eta > 0 and torrent.last_activity < (time.time() - maximum_eta):
-            self.logger.info(
-                "Deleting Stale torrent: Last activity is older than Maximum ETA "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
+        if maximum_eta > 0 and torrent.last_activity < (time_now - maximum_eta):
+            self._log_torrent(
+                logging.INFO,
+                "Deleting Stale torrent: Last activity is older than Maximum ETA ",
+                torrent,
             )
             self.delete.add(torrent.hash)
         else:
-            self.logger.trace(
-                "Skipping torrent: Reached Maximum completed "
-                "percentage and is active | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
+            self._log_torrent(
+                TRACE,
+                "Skipping torrent: Reached Maximum completed percentage and is active | ",
+                torrent,
             )
             return
 
     def _process_single_torrent_paused(self, torrent: qbittorrentapi.TorrentDictionary):
         self.timed_ignore_cache.add(torrent.hash)
         self.resume.add(torrent.hash)
-        self.logger.debug(
-            "Resuming incomplete paused torrent: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(logging.DEBUG, "Resuming incomplete paused torrent: ", torrent)
 
     def _process_single_torrent_already_sent_to_scan(
         self, torrent: qbittorrentapi.TorrentDictionary
     ):
-        self.logger.trace(
-            "Skipping torrent: Already sent for import | "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Skipping torrent: Already sent for import | ", torrent)
 
     def _process_single_torrent_errored(self, torrent: qbittorrentapi.TorrentDictionary):
-        self.logger.trace(
-            "Rechecking Erroed torrent: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Rechecking Erroed torrent: ", torrent)
         self.recheck.add(torrent.hash)
 
     def _process_single_torrent_fully_completed_torrent(
         self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
     ):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
-            self.logger.trace(
-                "Torrent State: Completed | Allowing Seeding | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(TRACE, "Torrent State: Completed | Allowing Seeding | ", torrent)
         else:
-            self.logger.info(
-                "Pausing Completed torrent: "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(logging.INFO, "Pausing Completed torrent: ", torrent)
             self.pause.add(torrent.hash)
             self.import_torrents.append(torrent)
 
@@ -2071,21 +2071,7 @@ class Arr:
         # torrent for some reason,
         # this ensures that we can safely remove it if the client is reporting
         # the status of the client as "Missing files"
-        self.logger.info(
-            "Deleting torrent with missing files: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(logging.INFO, "Deleting torrent with missing files: ", torrent)
         # We do not want to blacklist these!!
         self.skip_blacklist.add(torrent.hash)
 
@@ -2093,98 +2079,70 @@ class Arr:
         self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
     ):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
-            self.logger.trace(
-                "Torrent State: Queued Upload | Allowing Seeding | "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(TRACE, "Torrent State: Queued Upload | Allowing Seeding | ", torrent)
         else:
-            self.logger.info(
-                "Pausing uploading torrent: "
-                "[Progress: %s%%][Added On: %s]"
-                "[Availability: %s%%][Time Left: %s]"
-                "[Last active: %s] "
-                "| [%s] | %s (%s)",
-                round(torrent.progress * 100, 2),
-                datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-                round(torrent.availability * 100, 2),
-                timedelta(seconds=torrent.eta),
-                datetime.fromtimestamp(torrent.last_activity),
-                torrent.state_enum,
-                torrent.name,
-                torrent.hash,
-            )
+            self._log_torrent(logging.INFO, "Pausing uploading torrent: ", torrent)
             self.pause.add(torrent.hash)
 
     def _process_single_torrent_already_cleaned_up(
         self, torrent: qbittorrentapi.TorrentDictionary
     ):
-        self.logger.trace(
-            "Skipping file check: Already been cleaned up | "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Skipping file check: Already been cleaned up | ", torrent)
 
     def _process_single_torrent_delete_slow(self, torrent: qbittorrentapi.TorrentDictionary):
-        self.logger.trace(
-            "Deleting slow torrent: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Deleting slow torrent: ", torrent)
         self.delete.add(torrent.hash)
 
     def _process_single_torrent_process_files(
         self, torrent: qbittorrentapi.TorrentDictionary, special_case: bool = False
     ):
-        _remove_files = set()
-        total = len(torrent.files)
-        if total == 0:
+        # Every access to torrent.files is a round-trip to qBit, so fetch the list once.
+        files = torrent.files
+        if not files:
             return
         elif special_case:
             self.special_casing_file_check.add(torrent.hash)
-        for file in torrent.files:
-            file_path = pathlib.Path(file.name)
+        # Without any configured patterns the regexes can never match, so skip them outright.
+        folder_regex = self.folder_exclusion_regex_re if self.folder_exclusion_regex else None
+        file_name_regex = (
+            self.file_name_exclusion_regex_re if self.file_name_exclusion_regex else None
+        )
+        # Folder names are lower-cased before matching, which only matters when the
+        # patterns are case-sensitive; otherwise IGNORECASE already covers it.
+        lower_folders = bool(self.case_sensitive_matches)
+        keep = 0
+        remove = []
+        ext_allowlist = self._ext_allowlist
+        for file in files:
             # Acknowledge files that already been marked as "Don't download"
             if file.priority == 0:
-                total -= 1
+                continue
+            # qBittorrent always reports posix style relative paths.
+            parts = file.name.split("/")
+            file_name = parts[-1]
+            dot = file_name.rfind(".")
+            suffix = file_name[dot:] if 0 < dot < len(file_name) - 1 else ""
+            # The extension check is a set lookup, so it runs before any regex work.
+            if suffix.lower() not in ext_allowlist:
+                self.logger.debug(
+                    "Removing File: Not allowed | Extension: %s  | %s (%s) | %s ",
+                    suffix,
+                    torrent.name,
+                    torrent.hash,
+                    file.name,
+                )
+                remove.append(file.id)
                 continue
             # A folder within the folder tree matched the terms
             # in FolderExclusionRegex, mark it for exclusion.
-            if any(
-                self.folder_exclusion_regex_re.search(p.name.lower())
-                for p in file_path.parents
-                if (folder_match := p.name)
-            ):
+            folder_match = None
+            if folder_regex is not None:
+                for folder in reversed(parts[:-1]):
+                    key = folder.lower() if lower_folders else folder
+                    if folder and _regex_search(folder_regex, key) is not None:
+                        folder_match = folder
+                        break
+            if folder_match is not None:
                 self.logger.debug(
                     "Removing File: Not allowed | Parent: %s  | %s (%s) | %s ",
                     folder_match,
@@ -2192,77 +2150,35 @@ class Arr:
                     torrent.hash,
                     file.name,
                 )
-                _remove_files.add(file.id)
-                total -= 1
+                remove.append(file.id)
             # A file matched and entry in FileNameExclusionRegex, mark it for
             # exclusion.
-            elif (
-                match := self.file_name_exclusion_regex_re.search(file_path.name)
-            ) and match.group():
+            elif file_name_regex is not None and (
+                match := _regex_search(file_name_regex, file_name)
+            ):
                 self.logger.debug(
                     "Removing File: Not allowed | Name: %s  | %s (%s) | %s ",
-                    match.group(),
-                    torrent.name,
-                    torrent.hash,
-                    file.name,
-                )
-                _remove_files.add(file.id)
-                total -= 1
-            elif file_path.suffix.lower() not in self.file_extension_allowlist:
-                self.logger.debug(
-                    "Removing File: Not allowed | Extension: %s  | %s (%s) | %s ",
-                    file_path.suffix,
+                    match,
                     torrent.name,
                     torrent.hash,
                     file.name,
                 )
-                _remove_files.add(file.id)
-                total -= 1
-            # If all files in the torrent are marked for exclusion then delete the
-            # torrent.
-            if total == 0:
-                self.logger.info(
-                    "Deleting All files ignored: "
-                    "[Progress: %s%%][Added On: %s]"
-                    "[Availability: %s%%][Time Left: %s]"
-                    "[Last active: %s] "
-                    "| [%s] | %s (%s)",
-                    round(torrent.progress * 100, 2),
-                    datetime.fromtimestamp(
-                        self.recently_queue.get(torrent.hash, torrent.added_on)
-                    ),
-                    round(torrent.availability * 100, 2),
-                    timedelta(seconds=torrent.eta),
-                    datetime.fromtimestamp(torrent.last_activity),
-                    torrent.state_enum,
-                    torrent.name,
-                    torrent.hash,
-                )
-                self.delete.add(torrent.hash)
-            # Mark all bad files and folder for exclusion.
-            elif _remove_files and torrent.hash not in self.change_priority:
-                self.change_priority[torrent.hash] = list(_remove_files)
-            elif _remove_files and torrent.hash in self.change_priority:
-                self.change_priority[torrent.hash] = list(_remove_files)
+                remove.append(file.id)
+            else:
+                keep += 1
+        # If all files in the torrent are marked for exclusion then delete the
+        # torrent.
+        if keep == 0 and remove:
+            self._log_torrent(logging.INFO, "Deleting All files ignored: ", torrent)
+            self.delete.add(torrent.hash)
+        # Mark all bad files and folder for exclusion.
+        elif remove:
+            self.change_priority[torrent.hash] = remove
 
         self.cleaned_torrents.add(torrent.hash)
 
     def _process_single_torrent_unprocessed(self, torrent: qbittorrentapi.TorrentDictionary):
-        self.logger.trace(
-            "Skipping torrent: Unresolved state: "
-            "[Progress: %s%%][Added On: %s]"
-            "[Availability: %s%%][Time Left: %s]"
-            "[Last active: %s] "
-            "| [%s] | %s (%s)",
-            round(torrent.progress * 100, 2),
-            datetime.fromtimestamp(self.recently_queue.get(torrent.hash, torrent.added_on)),
-            round(torrent.availability * 100, 2),
-            timedelta(seconds=torrent.eta),
-            datetime.fromtimestamp(torrent.last_activity),
-            torrent.state_enum,
-            torrent.name,
-            torrent.hash,
-        )
+        self._log_torrent(TRACE, "Skipping torrent: Unresolved state: ", torrent)
 
     def _get_torrent_important_trackers(
         self, torrent: qbittorrentapi.TorrentDictionary
@@ -2516,108 +2432,119 @@ class Arr:
             if add_tags:
                 torrent.add_tags(add_tags)
 
-    def _process_single_torrent(self, torrent: qbittorrentapi.TorrentDictionary):
-        if torrent.category != RECHECK_CATEGORY:
-            self.manager.qbit_manager.cache[torrent.hash] = torrent.category
+    def _process_single_torrent(
+        self, torrent: qbittorrentapi.TorrentDictionary, time_now: float | None = None
+    ):
+        # Every attribute access on a TorrentDictionary goes through its AttrDict lookup,
+        # so read the fields the ladder below checks once.
+        hash_ = torrent.hash
+        # Interning makes the category comparisons below identity checks and lets the
+        # hash -> category cache share one string per category.
+        category = sys.intern(torrent.category)
+        qbit_manager = self.manager.qbit_manager
+        if category != RECHECK_CATEGORY:
+            qbit_manager.cache[hash_] = category
         self._process_single_torrent_trackers(torrent)
-        self.manager.qbit_manager.name_cache[torrent.hash] = torrent.name
-        time_now = time.time()
+        qbit_manager.name_cache[hash_] = torrent.name
+        if time_now is None:
+            time_now = time.time()
+        # The branch order below is significant (earlier, more specific checks take
+        # precedence), so states are tested inline rather than through a table.
+        state = torrent.state_enum
+        added_on = torrent.added_on
+        amount_left = torrent.amount_left
         leave_alone, _tracker_max_eta = self._should_leave_alone(torrent)
         maximum_eta = _tracker_max_eta
-        if torrent.category == FAILED_CATEGORY:
+        if category == FAILED_CATEGORY:
             # Bypass everything if manually marked as failed
             self._process_single_torrent_failed_cat(torrent)
-        elif torrent.category == RECHECK_CATEGORY:
+        elif category == RECHECK_CATEGORY:
             # Bypass everything else if manually marked for rechecking
             self._process_single_torrent_recheck_cat(torrent)
-        elif self.is_ignored_state(torrent):
-            self._process_single_torrent_ignored(torrent)
+        elif state in _IGNORED_STATES:
+            self._process_single_torrent_ignored(torrent, time_now)
             return  # Since to torrent is being ignored early exit here
         elif (
-            torrent.state_enum.is_downloading
-            and torrent.state_enum != TorrentStates.METADATA_DOWNLOAD
-            and torrent.hash not in self.special_casing_file_check
-            and torrent.hash not in self.cleaned_torrents
+            state.is_downloading
+            and state != TorrentStates.METADATA_DOWNLOAD
+            and hash_ not in self.special_casing_file_check
+            and hash_ not in self.cleaned_torrents
         ):
             self._process_single_torrent_process_files(torrent, True)
-        elif torrent.hash in self.timed_ignore_cache:
+        elif hash_ in self.timed_ignore_cache:
             # Do not touch torrents recently resumed/reached (A torrent can temporarily
             # stall after being resumed from a paused state).
             self._process_single_torrent_added_to_ignore_cache(torrent)
             return
-        elif torrent.state_enum == TorrentStates.QUEUED_UPLOAD:
+        elif state == TorrentStates.QUEUED_UPLOAD:
             self._process_single_torrent_queued_upload(torrent, leave_alone)
-        elif torrent.state_enum in (
-            TorrentStates.METADATA_DOWNLOAD,
-            TorrentStates.STALLED_DOWNLOAD,
-        ):
-            self._process_single_torrent_stalled_torrent(torrent, "Stalled State")
+        elif state in _STALLED_STATES:
+            self._process_single_torrent_stalled_torrent(torrent, "Stalled State", time_now)
         elif (
-            torrent.progress >= self.maximum_deletable_percentage
-            and self.is_complete_state(torrent) is False
-        ) and torrent.hash in self.cleaned_torrents:
-            self._process_single_torrent_percentage_threshold(torrent, maximum_eta)
+            torrent.progress >= self.maximum_deletable_percentage and state not in _COMPLETE_STATES
+        ) and hash_ in self.cleaned_torrents:
+            self._process_single_torrent_percentage_threshold(torrent, maximum_eta, time_now)
         # Resume monitored downloads which have been paused.
-        elif torrent.state_enum == TorrentStates.PAUSED_DOWNLOAD and torrent.amount_left != 0:
+        elif state == TorrentStates.PAUSED_DOWNLOAD and amount_left != 0:
             self._process_single_torrent_paused(torrent)
         # Ignore torrents which have been submitted to their respective Arr
         # instance for import.
         elif (
-            torrent.hash in self.manager.managed_objects[torrent.category].sent_to_scan_hashes
-        ) and torrent.hash in self.cleaned_torrents:
+            hash_ in self.manager.managed_objects[category].sent_to_scan_hashes
+        ) and hash_ in self.cleaned_torrents:
             self._process_single_torrent_already_sent_to_scan(torrent)
             return
         # Some times torrents will error, this causes them to be rechecked so they
         # complete downloading.
-        elif torrent.state_enum == TorrentStates.ERROR:
+        elif state == TorrentStates.ERROR:
             self._process_single_torrent_errored(torrent)
         # If a torrent was not just added,
         # and the amount left to download is 0 and the torrent
         # is Paused tell the Arr tools to process it.
         elif (
-            torrent.added_on > 0
+            added_on > 0
             and torrent.completion_on
-            and torrent.amount_left == 0
-            and torrent.state_enum != TorrentStates.PAUSED_UPLOAD
-            and self.is_complete_state(torrent)
+            and amount_left == 0
+            and state != TorrentStates.PAUSED_UPLOAD
+            and state in _COMPLETE_STATES
             and torrent.content_path
             and torrent.completion_on < time_now - 60
         ):
             self._process_single_torrent_fully_completed_torrent(torrent, leave_alone)
-        elif torrent.state_enum == TorrentStates.MISSING_FILES:
+        elif state == TorrentStates.MISSING_FILES:
             self._process_single_torrent_missing_files(torrent)
         # If a torrent is Uploading Pause it, as long as its for being Forced Uploaded.
         elif (
-            self.is_uploading_state(torrent)
+            state in _UPLOADING_STATES
             and torrent.seeding_time > 1
-            and torrent.amount_left == 0
-            and torrent.added_on > 0
+            and amount_left == 0
+            and added_on > 0
             and torrent.content_path
-            and torrent.amount_left == 0
-        ) and torrent.hash in self.cleaned_torrents:
+            and amount_left == 0
+        ) and hash_ in self.cleaned_torrents:
             self._process_single_torrent_uploading(torrent, leave_alone)
         # Mark a torrent for deletion
         elif (
-            torrent.state_enum != TorrentStates.PAUSED_DOWNLOAD
-            and torrent.state_enum.is_downloading
-            and self.recently_queue.get(torrent.hash, torrent.added_on)
+            state != TorrentStates.PAUSED_DOWNLOAD
+            and state.is_downloading
+            and self.recently_queue.get(hash_, added_on)
             < time_now - self.ignore_torrents_younger_than
             and 0 < maximum_eta < torrent.eta
             and not self.do_not_remove_slow
         ):
             self._process_single_torrent_delete_slow(torrent)
         # Process uncompleted torrents
-        elif torrent.state_enum.is_downloading:
+        elif state.is_downloading:
             # If a torrent availability hasn't reached 100% or more within the configurable
             # "IgnoreTorrentsYoungerThan" variable, mark it for deletion.
             if (
-                self.recently_queue.get(torrent.hash, torrent.added_on)
+                self.recently_queue.get(hash_, added_on)
                 < time_now - self.ignore_torrents_younger_than
                 and torrent.availability < 1
-            ) and torrent.hash in self.cleaned_torrents:
-                self._process_single_torrent_stalled_torrent(torrent, "Unavailable")
+            ) and hash_ in self.cleaned_torrents:
+                self._process_single_torrent_stalled_torrent(torrent, "Unavailable", time_now)
             else:
-                if torrent.hash in self.cleaned_torrents:
+                if hash_ in self.cleaned_torrents:
                     self._process_single_torrent_already_cleaned_up(torrent)
                     return
                 # A downloading torrent is not stalled, parse its contents.
@@ -2627,29 +2554,25 @@ class Arr:
             self._process_single_torrent_unprocessed(torrent)
 
     def refresh_download_queue(self):
-        if self.type == "sonarr":
-            self.queue = self.get_queue()
-        elif self.type == "radarr":
-            self.queue = self.get_queue()
-        self.cache = {
-            entry["downloadId"]: entry["id"] for entry in self.queue if entry.get("downloadId")
-        }
-        if self.type == "sonarr":
-            self.requeue_cache = defaultdict(set)
-            for entry in self.queue:
-                if r := entry.get("episodeId"):
-                    self.requeue_cache[entry["id"]].add(r)
-            self.queue_file_ids = {
-                entry["episodeId"] for entry in self.queue if entry.get("episodeId")
-            }
-        elif self.type == "radarr":
-            self.requeue_cache = {
-                entry["id"]: entry["movieId"] for entry in self.queue if entry.get("movieId")
-            }
-            self.queue_file_ids = {
-                entry["movieId"] for entry in self.queue if entry.get("movieId")
-            }
-        self._update_bad_queue_items()
+        self.queue = self.get_queue()
+        cache = {}
+        queue_file_ids = set()
+        is_sonarr = self.type == "sonarr"
+        file_key = "episodeId" if is_sonarr else "movieId"
+        requeue_cache = defaultdict(set) if is_sonarr else {}
+        for entry in self.queue:
+            if download_id := entry.get("downloadId"):
+                cache[download_id] = entry["id"]
+            if file_id := entry.get(file_key):
+                queue_file_ids.add(file_id)
+                if is_sonarr:
+                    requeue_cache[entry["id"]].add(file_id)
+                else:
+                    requeue_cache[entry["id"]] = file_id
+        self.cache = cache
+        self.requeue_cache = requeue_cache
+        self.queue_file_ids = queue_file_ids
+        self._update_bad_queue_items(self.queue)
 
     def get_queue(
         self,
@@ -2676,8 +2599,8 @@ class Arr:
             pass
         return res
 
-    def _update_bad_queue_items(self):
-        _temp = self.get_queue()
+    def _update_bad_queue_items(self, queue: list[dict] | None = None):
+        _temp = self.get_queue() if queue is None else queue
         _temp = filter(
             lambda x: x.get("status") == "completed"
             and x.get("trackedDownloadState") == "importPending"
@@ -2746,11 +2669,11 @@ class Arr:
             self.search_missing = False
             return
         else:
-            self.arr_db = SqliteDatabase(None)
+            # Connections are opened by peewee on the first query.
+            self.arr_db = SqliteDatabase(None, autoconnect=True)
             self.arr_db.init(f"file:{self.arr_db_file}?mode=ro", uri=True)
-            self.arr_db.connect()
 
-        self.db = SqliteDatabase(None)
+        self.db = SqliteDatabase(None, autoconnect=True)
         self.db.init(
             str(self.search_db_file),
             pragmas={
@@ -2776,17 +2699,15 @@ class Arr:
             class Meta:
                 database = self.db
 
-        self.db.connect()
+        self._search_tables = [Files, Queue, PersistingQueue]
         if db3:
 
             class Series(db3):
                 class Meta:
                     database = self.db
 
-            self.db.create_tables([Files, Queue, PersistingQueue, Series])
+            self._search_tables.append(Series)
             self.series_file_model = Series
-        else:
-            self.db.create_tables([Files, Queue, PersistingQueue])
 
         self.model_file = Files
         self.model_queue = Queue
@@ -2820,6 +2741,27 @@ class Arr:
         self.model_arr_command = Commands
         self.search_setup_completed = True
 
+    def _ensure_schema_created(self):
+        if self._schema_created:
+            return
+        self.db.create_tables(self._search_tables)
+        self._schema_created = True
+
+    def _reset_session_pool(self) -> None:
+        # The loops run in forked children; drop any keep-alive sockets inherited from the
+        # parent so they are never shared; the pool reopens connections on first use.
+        # PlaceHolderArr has no Arr server and therefore no session.
+        if self.session is not None:
+            self.session.close()
+
+    def _search_with_backoff(self, file_model, **kwargs) -> None:
+        # maybe_do_search returns False while the Arr's command queue is full; back off
+        # instead of polling it every 30 seconds for as long as it stays busy.
+        delay = 30
+        while self.maybe_do_search(file_model, **kwargs) is False:
+            time.sleep(delay)
+            delay = min(delay * 2, 300)
+
     def run_request_search(self):
         if self.request_search_timer is None or (
             self.request_search_timer > time.time() - self.search_requests_every_x_seconds
@@ -2833,10 +2775,10 @@ class Arr:
         while True:
             try:
                 self.db_request_update()
+                self._active_commands_cache = None
                 try:
                     for entry in self.db_get_request_files():
-                        while self.maybe_do_search(entry, request=True) is False:
-                            time.sleep(30)
+                        self._search_with_backoff(entry, request=True)
                     self.request_search_timer = time.time()
                     return
                 except NoConnectionrException as e:
@@ -2845,7 +2787,7 @@ class Arr:
                 except DelayLoopException:
                     raise
                 except Exception as e:
-                    self.logger.exception(e, exc_info=sys.exc_info())
+                    self.logger.exception(e, exc_info=True)
                 time.sleep(LOOP_SLEEP_TIMER)
             except DelayLoopException as e:
                 if e.type == "qbit":
@@ -2873,6 +2815,7 @@ class Arr:
     def run_search_loop(self) -> NoReturn:
         run_logs(self.logger, self.manager.category_allowlist)
         self.logger.setLevel(self._LOG_LEVEL)
+        self._reset_session_pool()
         self.register_search_mode()
         if not self.search_missing:
             return None
@@ -2886,30 +2829,26 @@ class Arr:
                 self.db_update()
                 self.run_request_search()
                 self.force_grab()
+                self._active_commands_cache = None
                 try:
                     for entry, todays, limit_bypass, series_search in self.db_get_files():
                         if timer < (datetime.now(timezone.utc) - loop_timer):
                             self.force_grab()
                             raise RestartLoopException
-                        while (
-                            self.maybe_do_search(
-                                entry,
-                                todays=todays,
-                                bypass_limit=limit_bypass,
-                                series_search=series_search,
-                            )
-                            is False
-                        ):
-                            time.sleep(30)
+                        self._search_with_backoff(
+                            entry,
+                            todays=todays,
+                            bypass_limit=limit_bypass,
+                            series_search=series_search,
+                        )
                     self.search_current_year += self._delta
-                    if self.search_in_reverse:
-                        if self.search_current_year > stopping_year:
-                            self.search_current_year = copy(count_start)
-                            self.loop_completed = True
-                    else:
-                        if self.search_current_year < stopping_year:
-                            self.search_current_year = copy(count_start)
-                            self.loop_completed = True
+                    if (
+                        self.search_current_year > stopping_year
+                        if self.search_in_reverse
+                        else self.search_current_year < stopping_year
+                    ):
+                        self.search_current_year = count_start
+                        self.loop_completed = True
                 except RestartLoopException:
                     self.logger.debug("Loop timer elapsed, restarting it.")
                 except NoConnectionrException as e:
@@ -2922,7 +2861,7 @@ class Arr:
                     self.logger.debug("Loop completed, restarting it.")
                     self.loop_completed = True
                 except Exception as e:
-                    self.logger.exception(e, exc_info=sys.exc_info())
+                    self.logger.exception(e, exc_info=True)
                 time.sleep(LOOP_SLEEP_TIMER)
             except DelayLoopException as e:
                 if e.type == "qbit":
@@ -2956,6 +2895,7 @@ class Arr:
     def run_torrent_loop(self) -> NoReturn:
         run_logs(self.logger, self.manager.category_allowlist)
         self.logger.setLevel(self._LOG_LEVEL)
+        self._reset_session_pool()
         while True:
             try:
                 try:
@@ -2978,7 +2918,7 @@ class Arr:
                     self.logger.hnotice("Detected Ctrl+C - Terminating process")
                     sys.exit(0)
                 except Exception as e:
-                    self.logger.error(e, exc_info=sys.exc_info())
+                    self.logger.error(e, exc_info=True)
                 time.sleep(LOOP_SLEEP_TIMER)
             except DelayLoopException as e:
                 if e.type == "qbit":
@@ -3041,7 +2981,9 @@ class PlaceHolderArr(Arr):
         self.requeue_cache = {}
         self.sent_to_scan = set()
         self.sent_to_scan_hashes = set()
-        self.files_probed = set()
+        self.probe_db_file = APPDATA_FOLDER.joinpath(f"{self._name}.probe.db")
+        self.files_probed: OrderedDict[tuple[str, int, float], None] = OrderedDict()
+        self._probe_model: type[ProbedFilesModel] | None = None
         self.import_torrents = []
         self.change_priority = dict()
         self.recheck = set()
@@ -3067,18 +3009,14 @@ class PlaceHolderArr(Arr):
         # Recheck all torrents marked for rechecking.
         if self.recheck:
             temp = defaultdict(list)
-            updated_recheck = []
             for h in self.recheck:
-
-                updated_recheck.append(h)
                 if c := self.manager.qbit_manager.cache.get(h):
                     temp[c].append(h)
-            self.manager.qbit.torrents_recheck(torrent_hashes=updated_recheck)
+            self.manager.qbit.torrents_recheck(torrent_hashes=list(self.recheck))
             for k, v in temp.items():
                 self.manager.qbit.torrents_set_category(torrent_hashes=v, category=k)
 
-            for k in updated_recheck:
-                self.timed_ignore_cache.add(k)
+            self.timed_ignore_cache.update(self.recheck)
             self.recheck.clear()
 
     def _process_failed(self):
@@ -3086,23 +3024,21 @@ class PlaceHolderArr(Arr):
             return
         to_delete_all = self.delete.union(self.skip_blacklist)
         skip_blacklist = {i.upper() for i in self.skip_blacklist}
-        if to_delete_all:
-            for arr in self.manager.managed_objects.values():
-                payload, hashes = arr.process_entries(to_delete_all)
-                if payload:
-                    for entry, hash_ in payload:
-                        if hash_ in arr.cache:
-                            arr._process_failed_individual(
-                                hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
-                            )
+        for arr in self.manager.managed_objects.values():
+            if not arr.cache:
+                continue
+            for entry, hash_ in arr.process_entries(to_delete_all):
+                arr._process_failed_individual(
+                    hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
+                )
 
-            # Remove all bad torrents from the Client.
-            self.manager.qbit.torrents_delete(hashes=to_delete_all, delete_files=True)
-            for h in to_delete_all:
-                if h in self.manager.qbit_manager.name_cache:
-                    del self.manager.qbit_manager.name_cache[h]
-                if h in self.manager.qbit_manager.cache:
-                    del self.manager.qbit_manager.cache[h]
+        # Remove all bad torrents from the Client.
+        self.manager.qbit.torrents_delete(hashes=to_delete_all, delete_files=True)
+        name_cache = self.manager.qbit_manager.name_cache
+        cache = self.manager.qbit_manager.cache
+        for h in to_delete_all:
+            name_cache.pop(h, None)
+            cache.pop(h, None)
         self.skip_blacklist.clear()
         self.delete.clear()
 
@@ -3120,14 +3056,18 @@ class PlaceHolderArr(Arr):
             torrents = self.manager.qbit_manager.client.torrents.info.all(
                 category=self.category, sort="added_on", reverse=False
             )
+            cache = self.manager.qbit_manager.cache
+            name_cache = self.manager.qbit_manager.name_cache
             for torrent in torrents:
-                if torrent.category != RECHECK_CATEGORY:
-                    self.manager.qbit_manager.cache[torrent.hash] = torrent.category
-                self.manager.qbit_manager.name_cache[torrent.hash] = torrent.name
-                if torrent.category == FAILED_CATEGORY:
+                hash_ = torrent.hash
+                category = sys.intern(torrent.category)
+                if category != RECHECK_CATEGORY:
+                    cache[hash_] = category
+                name_cache[hash_] = torrent.name
+                if category == FAILED_CATEGORY:
                     # Bypass everything if manually marked as failed
                     self._process_single_torrent_failed_cat(torrent)
-                elif torrent.category == RECHECK_CATEGORY:
+                elif category == RECHECK_CATEGORY:
                     # Bypass everything else if manually marked for rechecking
                     self._process_single_torrent_recheck_cat(torrent)
             self.process()
@@ -3137,7 +3077,7 @@ class PlaceHolderArr(Arr):
             self.logger.hnotice("Detected Ctrl+C - Terminating process")
             sys.exit(0)
         except Exception as e:
-            self.logger.error(e, exc_info=sys.exc_info())
+            self.logger.error(e, exc_info=True)
 
     def run_search_loop(self):
         return
@@ -3148,13 +3088,15 @@ class ArrManager:
         self.groups: set[str] = set()
         self.uris: set[str] = set()
         _update_config()
-        self.special_categories: set[str] = {FAILED_CATEGORY, RECHECK_CATEGORY}
-        self.category_allowlist: set[str] = self.special_categories.copy()
+        # The special categories come from the config, so build them after _update_config().
+        self.special_categories: frozenset[str] = frozenset({FAILED_CATEGORY, RECHECK_CATEGORY})
+        self.category_allowlist: set[str] = set(self.special_categories)
         self.completed_folders: set[pathlib.Path] = set()
         self.managed_objects: dict[str, Arr] = {}
         self.qbit: qbittorrentapi.Client = qbitmanager.client
         self.qbit_manager: qBitManager = qbitmanager
-        self.ffprobe_available: bool = self.qbit_manager.ffprobe_downloader.probe_path.exists()
+        self.ffprobe_path: pathlib.Path = self.qbit_manager.ffprobe_downloader.probe_path
+        self.ffprobe_available: bool = self.ffprobe_path.exists()
         self.logger = logging.getLogger(
             "ArrManager",
         )
@@ -3164,21 +3106,15 @@ class ArrManager:
         if not self.ffprobe_available:
             self.logger.error(
                 "'%s' was not found, disabling all functionality dependant on it",
-                self.qbit_manager.ffprobe_downloader.probe_path,
+                self.ffprobe_path,
             )
 
     def build_arr_instances(self):
         _update_config()
         for key in CONFIG.sections():
-            if search := re.match("(rad|son)arr.*", key, re.IGNORECASE):
+            if search := _ARR_SECTION_RE.match(key):
                 name = search.group(0)
-                match = search.group(1)
-                if match.lower() == "son":
-                    call_cls = SonarrAPI
-                elif match.lower() == "rad":
-                    call_cls = RadarrAPI
-                else:
-                    call_cls = None
+                call_cls = _ARR_CLS_MAP.get(search.group(1).lower())
                 try:
                     managed_object = Arr(name, self, client_cls=call_cls)
                     self.groups.add(name)
@@ -54,8 +54,9 @@ def update_config(file: str | None = None) -> str:
             CONFIG = MyConfig(str(CONFIG_FILE))
 
     FFPROBE_AUTO_UPDATE = CONFIG.get("Settings.FFprobeAutoUpdate", fallback=True)
-    FAILED_CATEGORY = CONFIG.get("Settings.FailedCategory", fallback="failed")
-    RECHECK_CATEGORY = CONFIG.get("Settings.RecheckCategory", fallback="recheck")
+    # Interned so comparisons against the (also interned) torrent categories short-circuit.
+    FAILED_CATEGORY = sys.intern(str(CONFIG.get("Settings.FailedCategory", fallback="failed")))
+    RECHECK_CATEGORY = sys.intern(str(CONFIG.get("Settings.RecheckCategory", fallback="recheck")))
     CONSOLE_LOGGING_LEVEL_STRING = CONFIG.get("Settings.ConsoleLevel", fallback="INFO")
     COMPLETED_DOWNLOAD_FOLDER = CONFIG.get_or_raise("Settings.CompletedDownloadFolder")
     NO_INTERNET_SLEEP_TIMER = CONFIG.get("Settings.NoInternetSleepTimer", fallback=60)
@@ -239,7 +239,7 @@ def _gen_default_torrent_table(category: str, cat_default: Table):
     torrent_table.add(nl())
     torrent_table.add(
         comment(
-            "Only files with these extensions will be allowed to be downloaded, comma separated strings."
+            "Only files with these extensions will be allowed to be downloaded, comma separated strings (matched case-insensitively)."
         )
     )
     torrent_table.add(
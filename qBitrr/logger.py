@@ -21,6 +21,11 @@ from qBitrr.config import (
 
 __all__ = ()
 
+TRACE = logging.DEBUG - 5
+NOTICE = logging.INFO + 3
+HNOTICE = logging.INFO + 4
+SUCCESS = logging.INFO + 5
+
 
 def addLoggingLevel(
     levelName, levelNum, methodName=None, logger=None
@@ -85,13 +90,13 @@ HAS_RUN = False
 def run_logs(logger: Logger, configkeys: Iterable | None = None) -> None:
     global HAS_RUN
     with contextlib.suppress(Exception):
-        addLoggingLevel("SUCCESS", logging.INFO + 5, "success", logger=logger)
+        addLoggingLevel("SUCCESS", SUCCESS, "success", logger=logger)
     with contextlib.suppress(Exception):
-        addLoggingLevel("HNOTICE", logging.INFO + 4, "hnotice", logger=logger)
+        addLoggingLevel("HNOTICE", HNOTICE, "hnotice", logger=logger)
     with contextlib.suppress(Exception):
-        addLoggingLevel("NOTICE", logging.INFO + 3, "notice", logger=logger)
+        addLoggingLevel("NOTICE", NOTICE, "notice", logger=logger)
     with contextlib.suppress(Exception):
-        addLoggingLevel("TRACE", logging.DEBUG - 5, "trace", logger=logger)
+        addLoggingLevel("TRACE", TRACE, "trace", logger=logger)
     _update_config()
     from qBitrr.config import CONSOLE_LOGGING_LEVEL_STRING
 
@@ -95,8 +95,10 @@ class qBitManager:
             procs.extend(processes)
         self.logger.notice("Starting %s child processes", count)
         try:
-            [p.start() for p in procs]
-            [p.join() for p in procs]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
         except KeyboardInterrupt:
             self.logger.hnotice("Detected Ctrl+C - Terminating process")
             sys.exit(0)
@@ -1,4 +1,12 @@
-from peewee import BooleanField, CharField, DateTimeField, IntegerField, Model, TextField
+from peewee import (
+    BooleanField,
+    CharField,
+    DateTimeField,
+    FloatField,
+    IntegerField,
+    Model,
+    TextField,
+)
 
 
 class FilesQueued(Model):
@@ -28,7 +36,7 @@ class EpisodeFilesModel(Model):
     AbsoluteEpisodeNumber = IntegerField(null=True)
     SceneAbsoluteEpisodeNumber = IntegerField(null=True)
     LastSearchTime = DateTimeField(formats=["%Y-%m-%d %H:%M:%S.%f"], null=True)
-    AirDateUtc = DateTimeField(formats=["%Y-%m-%d %H:%M:%S.%f"], null=True)
+    AirDateUtc = DateTimeField(formats=["%Y-%m-%d %H:%M:%S.%f"], null=True, index=True)
     Monitored = BooleanField(null=True)
     Searched = BooleanField(default=False)
     IsRequest = BooleanField(default=False)
@@ -50,3 +58,10 @@ class MovieQueueModel(Model):
 class EpisodeQueueModel(Model):
     EntryId = IntegerField(unique=True)
     Completed = BooleanField(default=False)
+
+
+class ProbedFilesModel(Model):
+    Path = TextField(primary_key=True)
+    Size = IntegerField()
+    MTime = FloatField()
+    Ok = BooleanField(default=False)
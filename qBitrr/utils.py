@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 import pathlib
 import random
 import socket
@@ -12,14 +13,36 @@ import ping3
 ping3.EXCEPTIONS = True
 
 
-def absolute_file_paths(directory: pathlib.Path | str) -> Iterator[pathlib.Path]:
-    error = True
-    while error is True:
+def scandir_files(directory: pathlib.Path | str) -> Iterator[tuple[os.DirEntry, str]]:
+    """Recursively yield every file under directory with its lower-cased suffix.
+
+    Symlinks are never followed, so nothing outside ``directory`` is yielded.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        path = stack.pop()
         try:
-            yield from pathlib.Path(directory).glob("**/*")
-            error = False
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry, os.path.splitext(entry.name)[1].lower()
         except FileNotFoundError as e:
             logging.warning("%s - %s", e.strerror, e.filename)
+        except OSError as e:
+            # Unreadable directories are skipped, as Path.glob() used to do.
+            logging.debug("Skipping directory: %s - %s", e.strerror, e.filename)
+
+
+def is_empty_dir(path: pathlib.Path | str) -> bool:
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+    except OSError as e:
+        # A directory we cannot read is never treated as empty, so it is left alone.
+        logging.debug("Cannot read directory: %s - %s", e.strerror, e.filename)
+        return False
 
 
 def validate_and_return_torrent_file(file: str) -> pathlib.Path:
@@ -109,11 +132,20 @@ def is_connected(hostname):
 
 
 class ExpiringSet:
+    """A set whose members expire ``max_age_seconds`` after they were last added.
+
+    Members are stored against their expiry on the monotonic clock, so membership is a
+    single dict lookup; expired members are purged lazily every 1024 additions.
+    """
+
+    _SWEEP_EVERY = 1024
+
     def __init__(self, *args, **kwargs):
         max_age_seconds = kwargs.get("max_age_seconds", 0)
         assert max_age_seconds > 0
         self.age = max_age_seconds
-        self.container = {}
+        self.container: dict = {}
+        self._adds = 0
         for arg in args:
             self.add(arg)
 
@@ -123,22 +155,32 @@ class ExpiringSet:
 
     def extend(self, args):
         """Add several items at once."""
-        for arg in args:
-            self.add(arg)
+        now = time.monotonic()
+        items = dict.fromkeys(args, now + self.age)
+        self.container.update(items)
+        self._adds += len(items)
+        if self._adds >= self._SWEEP_EVERY:
+            self._sweep(now)
+
+    update = extend
 
     def add(self, value):
-        self.container[value] = time.time()
+        now = time.monotonic()
+        self.container[value] = now + self.age
+        self._adds += 1
+        if self._adds >= self._SWEEP_EVERY:
+            self._sweep(now)
+
+    def _sweep(self, now: float):
+        self._adds = 0
+        self.container = {k: v for k, v in self.container.items() if v > now}
 
     def remove(self, item):
         del self.container[item]
 
     def contains(self, value):
-        if value not in self.container:
-            return False
-        if time.time() - self.container[value] > self.age:
-            del self.container[value]
-            return False
-        return True
+        expiry = self.container.get(value)
+        return expiry is not None and expiry > time.monotonic()
 
     __contains__ = contains
 
@@ -161,10 +203,7 @@ class ExpiringSet:
         return temp
 
     def __update__(self):
-        for k, b in self.container.copy().items():
-            if time.time() - b > self.age:
-                del self.container[k]
-                return False
+        self._sweep(time.monotonic())
 
     def __hash__(self):
         return hash(*(self.container.keys()))
@@ -0,0 +1,133 @@
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from peewee import SqliteDatabase
+
+from qBitrr import arss
+from qBitrr.logger import run_logs
+from qBitrr.tables import MoviesFilesModel
+
+
+class _StopLoop(BaseException):
+    pass
+
+
+class _StubConfig:
+    def get(self, key, fallback=None):
+        return fallback
+
+
+class PlaceHolderArrLoopTest(unittest.TestCase):
+    def _make_placeholder(self):
+        qbit_manager = SimpleNamespace(
+            logger=logging.getLogger("qBitrr-test"),
+            is_alive=True,
+            should_delay_torrent_scan=False,
+            cache={},
+            name_cache={},
+        )
+        manager = SimpleNamespace(
+            groups=set(),
+            category_allowlist={"failed", "recheck"},
+            qbit_manager=qbit_manager,
+        )
+        with mock.patch("qBitrr.config.CONFIG", _StubConfig()):
+            return arss.PlaceHolderArr("failed", manager)
+
+    def test_torrent_loop_runs_without_a_session(self):
+        arr = self._make_placeholder()
+        self.assertIsNone(arr.session)
+        arr.process_torrents = mock.Mock()
+        # The loop never returns, so stop it at the end of its first iteration.
+        with mock.patch.object(arss.time, "sleep", side_effect=_StopLoop):
+            with self.assertRaises(_StopLoop):
+                arr.run_torrent_loop()
+        arr.process_torrents.assert_called_once_with()
+
+
+def _make_arr(arr_type="radarr"):
+    arr = object.__new__(arss.Arr)
+    arr.type = arr_type
+    arr.logger = logging.getLogger(f"qBitrr-test-{arr_type}")
+    run_logs(arr.logger, set())
+    return arr
+
+
+def _movie_row(entry_id, searched=False, monitored=True, title="Movie"):
+    return {
+        "Title": title,
+        "Monitored": monitored,
+        "TmdbId": entry_id,
+        "Year": 2021,
+        "EntryId": entry_id,
+        "Searched": searched,
+        "MovieFileId": 0,
+        "IsRequest": False,
+        "QualityMet": False,
+    }
+
+
+class FlushTest(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteDatabase(":memory:")
+
+        class Movies(MoviesFilesModel):
+            class Meta:
+                database = self.db
+
+        self.db.create_tables([Movies])
+        self.model = Movies
+        self.arr = _make_arr()
+        self.arr.model_file = Movies
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_failing_chunk_does_not_drop_other_chunks(self):
+        rows = [_movie_row(i) for i in range(1, 121)]
+        # Title is NOT NULL, so the second 50-row chunk fails as a whole.
+        rows[59]["Title"] = None
+        with self.assertLogs(self.arr.logger, level="ERROR") as logs:
+            self.arr._flush(rows)
+        stored = {m.EntryId for m in self.model.select()}
+        self.assertEqual(stored, set(range(1, 51)) | set(range(101, 121)))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("rows 51-100 of 120", logs.output[0])
+
+    def test_searched_never_regresses(self):
+        self.arr._flush([_movie_row(1, searched=True), _movie_row(2, searched=False)])
+        self.arr._flush(
+            [_movie_row(1, searched=False, monitored=False), _movie_row(2, searched=True)]
+        )
+        movie_1 = self.model.get(self.model.EntryId == 1)
+        movie_2 = self.model.get(self.model.EntryId == 2)
+        self.assertTrue(movie_1.Searched)
+        # The other fields are still updated by the upsert.
+        self.assertFalse(movie_1.Monitored)
+        self.assertTrue(movie_2.Searched)
+
+
+class DbUpdateBatchedTest(unittest.TestCase):
+    def test_rows_are_flushed_per_batch(self):
+        arr = _make_arr()
+        arr._build_row = lambda db_entry, **kwargs: None if db_entry.Id == 3 else db_entry.Id
+        arr._flush = mock.Mock()
+        entries = [SimpleNamespace(Id=i) for i in range(1, 1201)]
+        arr._db_update_batched(entries)
+        batches = [c.args[0] for c in arr._flush.call_args_list]
+        self.assertEqual([len(b) for b in batches], [499, 500, 200])
+        self.assertNotIn(3, batches[0])
+
+    def test_failed_episode_prefetch_skips_the_entry(self):
+        arr = _make_arr("sonarr")
+        arr._fetch_episode_metadata = lambda entry_id: None if entry_id == 2 else {"id": entry_id}
+        arr._build_row = mock.Mock(side_effect=lambda db_entry, metadata, **kwargs: metadata)
+        arr._flush = mock.Mock()
+        arr._db_update_batched([SimpleNamespace(Id=i) for i in range(1, 4)])
+        arr._flush.assert_called_once_with([{"id": 1}, {"id": 3}], request=False, series=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
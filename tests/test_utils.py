@@ -0,0 +1,122 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from qBitrr.utils import ExpiringSet, is_empty_dir, scandir_files
+
+
+class ScandirFilesTest(unittest.TestCase):
+    def test_symlinks_are_not_followed(self):
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as outside:
+            root = pathlib.Path(root)
+            root.joinpath("show").mkdir()
+            root.joinpath("show", "episode.mkv").touch()
+            pathlib.Path(outside, "other.mkv").touch()
+            os.symlink(outside, root.joinpath("linked_dir"))
+            os.symlink(root, root.joinpath("show", "cycle"))
+            os.symlink(pathlib.Path(outside, "other.mkv"), root.joinpath("linked.mkv"))
+
+            found = {(entry.path, suffix) for entry, suffix in scandir_files(root)}
+
+        self.assertEqual(found, {(str(root.joinpath("show", "episode.mkv")), ".mkv")})
+
+    def test_unreadable_directory_is_skipped(self):
+        with tempfile.TemporaryDirectory() as root:
+            root = pathlib.Path(root)
+            root.joinpath("locked").mkdir()
+            root.joinpath("locked", "hidden.mkv").touch()
+            root.joinpath("episode.mkv").touch()
+            locked = str(root.joinpath("locked"))
+            real_scandir = os.scandir
+
+            def scandir(path):
+                if os.fspath(path) == locked:
+                    raise PermissionError(13, "Permission denied", locked)
+                return real_scandir(path)
+
+            with mock.patch("qBitrr.utils.os.scandir", side_effect=scandir):
+                found = [entry.path for entry, _ in scandir_files(root)]
+
+        self.assertEqual(found, [str(root.joinpath("episode.mkv"))])
+
+
+class IsEmptyDirTest(unittest.TestCase):
+    def test_empty_and_non_empty(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.assertTrue(is_empty_dir(root))
+            pathlib.Path(root, "file").touch()
+            self.assertFalse(is_empty_dir(root))
+
+    def test_unreadable_directory_is_not_empty(self):
+        with mock.patch("qBitrr.utils.os.scandir", side_effect=PermissionError(13, "denied")):
+            self.assertFalse(is_empty_dir("/does/not/matter"))
+
+    def test_not_a_directory_is_not_empty(self):
+        with tempfile.NamedTemporaryFile() as file:
+            self.assertFalse(is_empty_dir(file.name))
+
+
+class ExpiringSetTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("qBitrr.utils.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_members_expire_after_max_age(self):
+        s = ExpiringSet(max_age_seconds=10)
+        s.add("a")
+        self.now += 9.9
+        self.assertIn("a", s)
+        self.now += 0.2
+        self.assertNotIn("a", s)
+        self.assertEqual(len(s), 0)
+
+    def test_re_adding_refreshes_expiry(self):
+        s = ExpiringSet(max_age_seconds=10)
+        s.add("a")
+        self.now += 8
+        s.add("a")
+        self.now += 8
+        self.assertIn("a", s)
+
+    def test_update_is_extend_and_shares_one_expiry(self):
+        self.assertIs(ExpiringSet.update, ExpiringSet.extend)
+        s = ExpiringSet(max_age_seconds=10)
+        s.update(["a", "b"])
+        self.now += 5
+        s.extend(["c"])
+        self.now += 5.5
+        self.assertEqual(list(s), ["c"])
+        self.assertNotIn("a", s)
+        self.assertNotIn("b", s)
+
+    def test_sweep_drops_only_expired_members(self):
+        s = ExpiringSet(max_age_seconds=10)
+        s.add("old")
+        self.now += 5
+        s.add("live")
+        self.now += 6
+        # Trigger the lazy sweep; "old" is past its expiry, "live" is not.
+        s.update(range(ExpiringSet._SWEEP_EVERY))
+        self.assertNotIn("old", s.container)
+        self.assertIn("live", s)
+        self.assertEqual(s._adds, 0)
+        self.assertEqual(len(s), ExpiringSet._SWEEP_EVERY + 1)
+
+    def test_add_sweeps_every_n_additions(self):
+        s = ExpiringSet(max_age_seconds=10)
+        s.add("old")
+        self.now += 11
+        for i in range(ExpiringSet._SWEEP_EVERY - 2):
+            s.add(i)
+        self.assertIn("old", s.container)
+        s.add("last")
+        self.assertNotIn("old", s.container)
+        self.assertIn("last", s)
+
+
+if __name__ == "__main__":
+    unittest.main()